@@ -380,33 +380,34 @@ class PredefinedAssetBacktest(BaseBacktest):
         epsilon = 1e-12
         date = state.date()
         mtm = 0
-        self.historical_holdings[date] = {}
-        self.historical_weights[date] = {}
+        # build the day's holdings and weights locally and write them to the pandas series once, rather than
+        # indexing into the series for every instrument
+        holdings = {}
+        notionals = {}
         for instrument, units in self.holdings.items():
             if abs(units) > epsilon:
-                self.historical_holdings[date][instrument] = units
+                holdings[instrument] = units
 
                 if isinstance(instrument, Cash):
                     fixing = 1
                 else:
                     tag, window = valuation_method.data_tag, valuation_method.window
                     if window:
-                        start = dt.datetime.combine(state.date(), window.start)
-                        end = dt.datetime.combine(state.date(), window.end)
+                        start = dt.datetime.combine(date, window.start)
+                        end = dt.datetime.combine(date, window.end)
                         fixings = self.data_handler.get_data_range(start, end, instrument, tag)
                         fixing = np.mean(fixings) if len(fixings) else np.nan
                     else:  # no time window specified, use daily fixing
-                        fixing = self.data_handler.get_data(state.date(), instrument, tag)
+                        fixing = self.data_handler.get_data(date, instrument, tag)
 
                 notional = fixing * units
-                self.historical_weights[date][instrument] = notional
+                notionals[instrument] = notional
                 mtm += notional
 
+        self.historical_holdings[date] = holdings
+        self.historical_weights[date] = {instrument: notional / mtm for instrument, notional in notionals.items()}
         self.performance[date] = mtm
 
-        for instrument, notional in self.historical_weights[date].items():
-            self.historical_weights[date][instrument] = notional / mtm
-
     def get_level(self, date: dt.date) -> float:
         return self.performance[date]
 
@@ -62,6 +62,10 @@ class DataHandler(object):
     def update(self, state: dt.datetime):
         self._clock.update(state)
 
+    def prefetch(self):
+        # loading data ahead of time does not move the clock, so the look-ahead checks still apply
+        self._data_mgr.prefetch()
+
     def _utc_time(self, state: Union[dt.date, dt.datetime]):
         # only switch to utc time if the datetime you've been sent is timezone naive
         if isinstance(state, dt.datetime) and (state.tzinfo is None or state.tzinfo.utcoffset(state) is None):
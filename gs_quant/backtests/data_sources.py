@@ -14,6 +14,7 @@ specific language governing permissions and limitations
 under the License.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from dataclasses_json import dataclass_json, config
 import datetime as dt
@@ -28,6 +29,7 @@ from gs_quant.base import field_metadata, static_field
 from gs_quant.data import DataFrequency, Dataset
 from gs_quant.instrument import Instrument
 from gs_quant.json_convertors import decode_pandas_series, encode_pandas_series
+from gs_quant.session import GsSession
 
 
 class MissingDataStrategy(Enum):
@@ -56,6 +58,12 @@ class DataSource:
                        end: Union[dt.date, dt.datetime, int]):
         raise RuntimeError("Implemented by subclass")
 
+    def prefetch(self):
+        """
+        Load any data which can be retrieved up front, ahead of the first request for it
+        """
+        pass
+
 
 @dataclass_json
 @dataclass
@@ -70,22 +78,24 @@ class GsDataSource(DataSource):
     def __post_init__(self):
         self.loaded_data = None
 
+    def _load(self, start: Union[dt.date, dt.datetime]):
+        self.loaded_data = Dataset(self.data_set).get_data(start, self.max_date, assetId=(self.asset_id,))
+
+    def prefetch(self):
+        if self.loaded_data is None and self.min_date:
+            self._load(self.min_date)
+
     def get_data(self, state: Union[dt.date, dt.datetime] = None):
         if self.loaded_data is None:
-            ds = Dataset(self.data_set)
             if self.min_date:
-                self.loaded_data = ds.get_data(self.min_date, self.max_date, assetId=(self.asset_id,))
+                self._load(self.min_date)
             else:
-                return ds.get_data(state, state, assetId=(self.asset_id,))[self.value_header]
+                return Dataset(self.data_set).get_data(state, state, assetId=(self.asset_id,))[self.value_header]
         return self.loaded_data[self.value_header].at[pd.to_datetime(state)]
 
     def get_data_range(self, start: Union[dt.date, dt.datetime], end: Union[dt.date, dt.datetime, int]):
         if self.loaded_data is None:
-            ds = Dataset(self.data_set)
-            if self.min_date:
-                self.loaded_data = ds.get_data(self.min_date, self.max_date, assetId=(self.asset_id,))
-            else:
-                self.loaded_data = ds.get_data(start, self.max_date, assetId=(self.asset_id,))
+            self._load(self.min_date or start)
         if isinstance(end, int):
             return self.loaded_data.loc[self.loaded_data.index < start].tail(end)
         return self.loaded_data.loc[(start < self.loaded_data.index) & (self.loaded_data.index <= end)]
@@ -114,6 +124,19 @@ class GenericDataSource(DataSource):
 
     def __post_init__(self):
         self._tz_aware = isinstance(self.data_set.index[0], dt.datetime) and self.data_set.index[0].tzinfo is not None
+        self._values_by_state = None
+
+    def _lookup(self, state):
+        # the backtest asks for single values on every tick, so index the series with a plain dict up front rather
+        # than going through pandas indexing each time
+        if self._values_by_state is None:
+            self._values_by_state = dict(zip(self.data_set.index, self.data_set.values)) \
+                if self.data_set.index.is_unique else {}
+        values_by_state = self._values_by_state
+        key = pd.Timestamp(state)
+        if key in values_by_state:
+            return values_by_state[key]
+        return values_by_state.get(state, None)
 
     def get_data(self, state: Union[dt.date, dt.datetime, Iterable]):
         """
@@ -126,11 +149,15 @@ class GenericDataSource(DataSource):
 
         if self._tz_aware and (state.tzinfo is None or state.tzinfo.utcoffset(state) is None):
             state = pytz.utc.localize(state)
+        value = self._lookup(state)
+        if value is not None:
+            return value
         if pd.Timestamp(state) in self.data_set:
             return self.data_set[pd.Timestamp(state)]
         elif state in self.data_set or self.missing_data_strategy == MissingDataStrategy.fail:
             return self.data_set[state]
         else:
+            self._values_by_state = None
             if isinstance(self.data_set.index, pd.DatetimeIndex):
                 self.data_set.at[pd.to_datetime(state)] = np.nan
                 self.data_set.sort_index(inplace=True)
@@ -179,6 +206,31 @@ class DataManager:
                                'Data Manager')
         self._data_sources[key] = GenericDataSource(series) if isinstance(series, pd.Series) else series
 
+    def prefetch(self, max_workers: int = None):
+        """
+        Load the data for all data sources which support it, retrieving from each source concurrently
+
+        :param max_workers: maximum number of threads used to load the data, defaults to one per data source
+        """
+        sources = tuple(s for s in self._data_sources.values() if type(s).prefetch is not DataSource.prefetch)
+        if not sources:
+            return
+        # sessions are thread local, so make the current one available to the loading threads
+        session = GsSession.current if GsSession.current_is_set else None
+
+        def prefetch_source(source: DataSource):
+            if session is not None:
+                GsSession.push(session)
+            try:
+                source.prefetch()
+            finally:
+                if session is not None:
+                    GsSession.pop()
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(sources)) as pool:
+            for f in [pool.submit(prefetch_source, source) for source in sources]:
+                f.result()
+
     def get_data(self, state: Union[dt.date, dt.datetime], instrument: Instrument, valuation_type: ValuationFixingType):
         key = (DataFrequency.REAL_TIME if isinstance(state, dt.datetime) else DataFrequency.DAILY,
                instrument.name.split('_')[-1], valuation_type)
@@ -19,19 +19,22 @@ from gs_quant.backtests.action_handler import ActionHandlerBaseFactory, ActionHa
 from gs_quant.backtests.actions import Action, AddTradeAction, AddTradeActionInfo
 from gs_quant.backtests.backtest_engine import BacktestBaseEngine
 from gs_quant.backtests.backtest_objects import PredefinedAssetBacktest
+from gs_quant.backtests.backtest_utils import make_list
 from gs_quant.backtests.execution_engine import SimulatedExecutionEngine
 from gs_quant.backtests.core import ValuationMethod
 from gs_quant.backtests.data_sources import DataManager
 from gs_quant.backtests.order import *
+from gs_quant.backtests.triggers import TriggerInfo
 from gs_quant.datetime import is_business_day, prev_business_date, business_day_offset
 from pandas import bdate_range, to_datetime
 from pandas.tseries.offsets import BDay
-from collections import deque
-from itertools import compress
+from cachetools import LRUCache
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, compress
 from pytz import timezone
-from functools import reduce
 import datetime as dt
-from typing import Union, Tuple
+import numpy as np
+from typing import Union, Tuple, List
 from tqdm import tqdm
 
 # Action Implementations
@@ -40,24 +43,33 @@ from tqdm import tqdm
 class AddTradeActionImpl(ActionHandler):
     def __init__(self, action: AddTradeAction):
         super().__init__(action)
+        # the priceables and their quantities are the same every time the action is applied
+        self._priceables = tuple(action.priceables)
+        self._quantities = tuple(p.instrument_quantity * 1 for p in self._priceables)
+        self._trade_duration = action.trade_duration if isinstance(action.trade_duration, dt.timedelta) else None
 
     def generate_orders(self, state: dt.datetime, backtest: PredefinedAssetBacktest, info: AddTradeActionInfo):
+        quantities = self._quantities if info is None else (info.scaling,) * len(self._priceables)
+        source = self.action.name
 
+        if self._trade_duration is None:
+            return [OrderAtMarket(instrument=p, quantity=q, generation_time=state, execution_datetime=state,
+                                  source=source) for p, q in zip(self._priceables, quantities)]
+
+        # create close orders alongside the open orders
+        close_time = state + self._trade_duration
         orders = []
-        for pricable in self.action.priceables:
-            quantity = pricable.instrument_quantity * 1 if info is None else info.scaling
+        for pricable, quantity in zip(self._priceables, quantities):
             orders.append(OrderAtMarket(instrument=pricable,
                                         quantity=quantity,
                                         generation_time=state,
                                         execution_datetime=state,
-                                        source=self.action.name))
-            if isinstance(self.action.trade_duration, dt.timedelta):
-                # create close order
-                orders.append(OrderAtMarket(instrument=pricable,
-                                            quantity=quantity * -1,
-                                            generation_time=state,
-                                            execution_datetime=state + self.action.trade_duration,
-                                            source=self.action.name))
+                                        source=source))
+            orders.append(OrderAtMarket(instrument=pricable,
+                                        quantity=quantity * -1,
+                                        generation_time=state,
+                                        execution_datetime=close_time,
+                                        source=source))
         return orders
 
     def apply_action(self, state: dt.datetime, backtest: PredefinedAssetBacktest, info=None):
@@ -91,11 +103,15 @@ class PredefinedAssetEngineActionFactory(ActionHandlerBaseFactory):
 class PredefinedAssetEngine(BacktestBaseEngine):
 
     def get_action_handler(self, action: Action) -> Action:
-        handler_factory = PredefinedAssetEngineActionFactory(self.action_impl_map)
-        return handler_factory.get_action_handler(action)
+        # handlers only hold their action, so build one per action rather than one every time a trigger fires
+        handler = self._action_handlers.get(id(action))
+        if handler is None or handler.action is not action:
+            handler = self._handler_factory.get_action_handler(action)
+            self._action_handlers[id(action)] = handler
+        return handler
 
     def supports_strategy(self, strategy):
-        all_actions = reduce(lambda x, y: x + y, (map(lambda x: x.actions, strategy.triggers)))
+        all_actions = chain.from_iterable(t.actions for t in strategy.triggers)
         try:
             for x in all_actions:
                 self.get_action_handler(x)
@@ -112,11 +128,14 @@ class PredefinedAssetEngine(BacktestBaseEngine):
         if action_impl_map is None:
             action_impl_map = {Action: SubmitOrderActionImpl}
         self.action_impl_map = action_impl_map
+        self._handler_factory = PredefinedAssetEngineActionFactory(self.action_impl_map)
+        self._action_handlers = {}
         self.calendars = calendars
         self.tz = tz
         self.data_handler = DataHandler(data_mgr, tz=tz)
         self.valuation_method = valuation_method
         self.execution_engine = None
+        self._date_grid_cache = LRUCache(32)
 
     def _eod_valuation_time(self):
         if self.valuation_method.window:
@@ -124,10 +143,30 @@ class PredefinedAssetEngine(BacktestBaseEngine):
         else:
             return dt.time(23)
 
-    def _timer(self, strategy, start, end, frequency, states=None):
-        dates = list(map(lambda x: x.date(), to_datetime(bdate_range(start=start, end=end, freq=frequency)))) \
-            if states is None else states
+    def _business_dates(self, dates):
+        if self.calendars is None:
+            return dates
+        return list(compress(dates, is_business_day(dates, (None if self.calendars.lower() == 'weekend'
+                                                            else self.calendars))))
+
+    def _date_grid(self, start, end, frequency, times):
+        # every combination of the backtest dates and the times of day, cached as this is the same for successive
+        # backtests over the same window
+        key = (start, end, frequency, times, self.calendars)
+        if key not in self._date_grid_cache:
+            dates = self._business_dates(list(map(lambda x: x.date(),
+                                                  to_datetime(bdate_range(start=start, end=end, freq=frequency)))))
+            if any(t.tzinfo is not None for t in times):
+                grid = tuple(dt.datetime.combine(d, t) for d in dates for t in times)
+            else:
+                days = np.array(dates, dtype='datetime64[D]').astype('datetime64[us]')
+                offsets = np.array([dt.timedelta(hours=t.hour, minutes=t.minute, seconds=t.second,
+                                                 microseconds=t.microsecond) for t in times], dtype='timedelta64[us]')
+                grid = tuple((days[:, None] + offsets[None, :]).ravel().tolist())
+            self._date_grid_cache[key] = grid
+        return self._date_grid_cache[key]
 
+    def _timer(self, strategy, start, end, frequency, states=None):
         all_times = []
         times = list()
         for trigger in strategy.triggers:
@@ -140,21 +179,20 @@ class PredefinedAssetEngine(BacktestBaseEngine):
                     else:
                         times.append(t)
         times.append(self._eod_valuation_time())
-        times = list(dict.fromkeys(times))
-
-        if self.calendars is not None:
-            dates = list(compress(dates, is_business_day(dates, (None if self.calendars.lower() == 'weekend'
-                                                                 else self.calendars))))
-
-        for d in dates:
-            if isinstance(d, dt.datetime):
-                all_times.append(d)
-                for t in times:
-                    if d.tzinfo is not None and d.tzinfo.utcoffset(d) is not None:
-                        all_times.append(d.tzinfo.localize(dt.datetime.combine(d.date(), t)))
-            else:
-                for t in times:
-                    all_times.append(dt.datetime.combine(d, t))
+        times = tuple(dict.fromkeys(times))
+
+        if states is None:
+            all_times.extend(self._date_grid(start, end, frequency, times))
+        else:
+            for d in self._business_dates(states):
+                if isinstance(d, dt.datetime):
+                    all_times.append(d)
+                    for t in times:
+                        if d.tzinfo is not None and d.tzinfo.utcoffset(d) is not None:
+                            all_times.append(d.tzinfo.localize(dt.datetime.combine(d.date(), t)))
+                else:
+                    for t in times:
+                        all_times.append(dt.datetime.combine(d, t))
         all_times = list(set(all_times))
         all_times.sort()
         return all_times
@@ -169,11 +207,15 @@ class PredefinedAssetEngine(BacktestBaseEngine):
     def run_backtest(self, strategy, start, end, frequency="B", states=None, initial_value=100):
         # initialize backtest object
         self.data_handler.reset_clock()
+        self._action_handlers.clear()
         backtest = PredefinedAssetBacktest(self.data_handler, initial_value)
 
         # initialize execution engine
         self.execution_engine = SimulatedExecutionEngine(self.data_handler)
 
+        # load the market data for all sources up front, rather than stalling on each one inside the loop
+        self.data_handler.prefetch()
+
         if states is not None:
             timer = self._timer(strategy, start, end, frequency, states)
         else:
@@ -190,42 +232,68 @@ class PredefinedAssetEngine(BacktestBaseEngine):
         self._run(strategy, timer, backtest)
         return backtest
 
+    def run_backtests_parallel(self, strategies, start, end, frequency="B", states=None, initial_value=100,
+                               n_workers=None) -> List[PredefinedAssetBacktest]:
+        """
+        Run independent strategies over the same period, each in its own worker process
+
+        :param strategies: the strategies to backtest
+        :param start: start date of the backtests
+        :param end: end date of the backtests
+        :param frequency: frequency of the backtest dates
+        :param states: optional explicit states to run the backtests on
+        :param initial_value: initial value of each backtest
+        :param n_workers: maximum number of worker processes, defaults to the number of processors
+        :return: list of backtests, in the same order as strategies
+        """
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(self.run_backtest, strategy, start, end, frequency, states, initial_value)
+                       for strategy in make_list(strategies)]
+            return [f.result() for f in futures]
+
     def _run(self, strategy, timer, backtest: PredefinedAssetBacktest):
-        events = deque()
+        # triggers which only depend on time are evaluated across the whole timer up front, any others (including
+        # triggers without a batch implementation) are evaluated date by date
+        trigger_masks = []
+        for trigger in strategy.triggers:
+            has_triggered_batch = getattr(trigger, 'has_triggered_batch', None)
+            trigger_masks.append(has_triggered_batch(timer, backtest) if has_triggered_batch else None)
+        eod_time = self._eod_valuation_time()
+        valuation_mask = [state.time() == eod_time for state in timer]
 
-        for state in tqdm(timer):
+        for i, state in enumerate(tqdm(timer)):
             # update to latest data
             self.data_handler.update(state)
 
-            # see if any submitted orders have been executed
-            fills = self.execution_engine.ping(state)
-            events.extend(fills)
-
-            # generate a market event
-            events.append(MarketEvent())
-
-            # create valuation event when it's due for daily valuation
-            if state.time() == self._eod_valuation_time():
-                events.append(ValuationEvent())
-
-            while events:
-                event = events.popleft()
-
-                if event.type == 'Market':  # market event (new mkt data coming in)
-                    for trigger in strategy.triggers:
-                        trigger_info = trigger.has_triggered(state, backtest)
-                        if trigger_info.triggered:
-                            for action in trigger.actions:
-                                info_dict = trigger_info.info_dict
-                                info = info_dict[type(action)] if info_dict and type(action) in info_dict else None
-                                orders = self.get_action_handler(action).apply_action(state, backtest, info)
-                                backtest.record_orders(orders)
-                                events.extend([OrderEvent(o) for o in orders])
-                elif event.type == 'Order':  # order event (submit the order to execution engine)
-                    self.execution_engine.submit_order(event)
-                elif event.type == 'Fill':  # fill event (update backtest with the fill results)
-                    backtest.update_fill(event)
-                elif event.type == 'Valuation':  # valuation event (calculate daily level)
-                    backtest.mark_to_market(state, self.valuation_method)
+            # see if any submitted orders have been executed and update backtest with the fill results
+            for fill in self.execution_engine.ping(state):
+                backtest.update_fill(fill)
+
+            # new market data coming in, generate orders from the triggers
+            orders = []
+            for trigger, mask in zip(strategy.triggers, trigger_masks):
+                if mask is None:
+                    trigger_info = trigger.has_triggered(state, backtest)
+                    if not trigger_info.triggered:
+                        continue
+                elif mask[i]:
+                    trigger_info = TriggerInfo(True)
+                else:
+                    continue
+
+                for action in trigger.actions:
+                    info_dict = trigger_info.info_dict
+                    info = info_dict[type(action)] if info_dict and type(action) in info_dict else None
+                    action_orders = self.get_action_handler(action).apply_action(state, backtest, info)
+                    backtest.record_orders(action_orders)
+                    orders.extend(action_orders)
+
+            # calculate daily level when it's due for daily valuation
+            if valuation_mask[i]:
+                backtest.mark_to_market(state, self.valuation_method)
+
+            # submit the orders to execution engine
+            for order in orders:
+                self.execution_engine.submit_order(OrderEvent(order))
 
         return backtest
@@ -126,6 +126,10 @@ class IntradayTriggerRequirements(TriggerRequirements):
     def has_triggered(self, state: Union[dt.date, dt.datetime], backtest: BackTest = None) -> TriggerInfo:
         return TriggerInfo(state.time() in self._trigger_times)
 
+    def has_triggered_batch(self, states: Iterable[dt.datetime], backtest: BackTest = None) -> np.ndarray:
+        trigger_times = set(self._trigger_times)
+        return np.fromiter((s.time() in trigger_times for s in states), dtype=bool)
+
 
 @dataclass_json
 @dataclass
@@ -243,6 +247,15 @@ class DateTriggerRequirements(TriggerRequirements):
 
         return TriggerInfo(state in self.dates)
 
+    def has_triggered_batch(self, states: Iterable[Union[dt.date, dt.datetime]], backtest: BackTest = None) \
+            -> np.ndarray:
+        if self.entire_day:
+            dates = set(self.dates_from_datetimes)
+            return np.fromiter(((s.date() if isinstance(s, dt.datetime) else s) in dates for s in states), dtype=bool)
+
+        dates = set(self.dates)
+        return np.fromiter((s in dates for s in states), dtype=bool)
+
     def get_trigger_times(self):
         return self.dates_from_datetimes or self.dates
 
@@ -337,6 +350,27 @@ class Trigger:
         """
         return self.trigger_requirements.has_triggered(state, backtest)
 
+    def has_triggered_batch(self, states: Iterable[dt.date], backtest: BackTest = None) -> Optional[np.ndarray]:
+        """
+        Evaluate the trigger over all states at once, for triggers which only depend on time
+        :param states: the states to evaluate the trigger at
+        :param backtest:
+        :return:
+            a boolean mask aligned to states, or None if the trigger has to be evaluated state by state using
+            has_triggered
+        """
+        if type(self).has_triggered is not Trigger.has_triggered:
+            return None
+
+        # The requirements' batch implementation only stands in for the has_triggered of the class defining it, not
+        # for any override of has_triggered in a subclass
+        requirements_type = type(self.trigger_requirements)
+        batch_type = next((c for c in requirements_type.__mro__ if 'has_triggered_batch' in c.__dict__), None)
+        if batch_type is None or requirements_type.has_triggered is not batch_type.has_triggered:
+            return None
+
+        return self.trigger_requirements.has_triggered_batch(states, backtest)
+
     def get_trigger_times(self):
         return self.trigger_requirements.get_trigger_times()
 
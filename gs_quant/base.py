@@ -21,14 +21,19 @@ import sys
 import typing
 from abc import ABC, ABCMeta, abstractmethod
 from collections import namedtuple
-from dataclasses import Field, InitVar, MISSING, dataclass, field, fields, replace
+from dataclasses import Field, InitVar, MISSING, dataclass, field, fields, is_dataclass, replace
 from enum import EnumMeta, Enum
 from functools import update_wrapper
-from typing import Iterable, Mapping, Optional, Union, Tuple
+from inspect import getattr_static
+from itertools import repeat
+from operator import attrgetter
+from typing import Callable, FrozenSet, Iterable, Mapping, Optional, Union, Tuple
 
 import numpy as np
 from dataclasses_json import config, global_config, LetterCase, dataclass_json
-from dataclasses_json.core import _decode_generic, _is_supported_generic
+from dataclasses_json.api import DataClassJsonMixin
+from dataclasses_json.core import _asdict, _decode_dataclass, _decode_generic, _encode_json_type, _is_supported_generic, \
+    _user_overrides_or_exts
 from inflection import camelize, underscore
 
 from gs_quant.context_base import ContextBase, ContextMeta
@@ -43,7 +48,30 @@ __getattribute__ = object.__getattribute__
 __setattr__ = object.__setattr__
 
 _rename_cache = {}
+_camelize_cache = {}
+_class_dir_cache = {}
 _is_supported_generic_cache = {}
+_type_matcher_cache = {}
+_type_converter_cache = {}
+_enum_members_by_lower_value_cache = {}
+_value_decoder_cache = {}
+_from_dict_decoders_cache = {}
+_to_dict_encoders_cache = {}
+_enum_value_cache = {}
+_arg_names_cache = {}
+_slot_names_cache = {}
+
+if sys.version_info >= (3, 9):
+    from types import GenericAlias
+    _generic_alias_types = (typing._GenericAlias, GenericAlias)
+else:
+    _generic_alias_types = (typing._GenericAlias,)
+
+if sys.version_info >= (3, 10):
+    from types import UnionType
+    _union_types = (UnionType,)
+else:
+    _union_types = ()
 
 
 def exclude_none(o):
@@ -64,11 +92,190 @@ def is_instance_or_iterable(o, t):
 
 def _get_underscore(arg):
     if arg not in _rename_cache:
-        _rename_cache[arg] = underscore(arg)
+        # Interned, as field names are, so that looking the result up in dicts keyed by field name hits on identity
+        _rename_cache[arg] = sys.intern(underscore(arg))
 
     return _rename_cache[arg]
 
 
+def _get_camelize(arg):
+    if arg not in _camelize_cache:
+        _camelize_cache[arg] = sys.intern(camelize(arg, uppercase_first_letter=False))
+
+    return _camelize_cache[arg]
+
+
+def _get_class_dir(cls):
+    if cls not in _class_dir_cache:
+        _class_dir_cache[cls] = frozenset(dir(cls))
+
+    return _class_dir_cache[cls]
+
+
+def _get_slot_names(cls) -> Tuple[str, ...]:
+    """The (mangled) names of the slots declared by cls and its bases, other than __dict__ and __weakref__"""
+    if cls not in _slot_names_cache:
+        names = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get('__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name in ('__dict__', '__weakref__'):
+                    continue
+                if name.startswith('__') and not name.endswith('__'):
+                    name = f'_{klass.__name__.lstrip("_")}{name}'
+                names.append(name)
+
+        _slot_names_cache[cls] = tuple(names)
+
+    return _slot_names_cache[cls]
+
+
+def _never_matches(_val):
+    return False
+
+
+def _get_instance_types(tp) -> Optional[Tuple[type, ...]]:
+    """The classes a value must be an instance of to match tp, if that is all the matcher for tp checks"""
+    if isinstance(tp, _union_types):
+        return _get_instance_types(Union[tp.__args__])
+    if isinstance(tp, _generic_alias_types):
+        if getattr(tp, '_special', False) or tp.__origin__ != Union:
+            return None
+        args = tp.__args__
+        if float in args:
+            args += (int,)
+        instance_types = tuple(_get_instance_types(arg) for arg in args)
+        if not all(instance_types):
+            return None
+        return tuple(t for types in instance_types for t in types)
+    if not isinstance(tp, type):
+        return None
+    return (str, Enum) if tp == str else (tp,)
+
+
+def _get_enum_type(tp) -> Optional[EnumMeta]:
+    """The enum class of an enum or optional enum type hint tp"""
+    if isinstance(tp, _union_types):
+        return _get_enum_type(Union[tp.__args__])
+    if isinstance(tp, _generic_alias_types) and tp.__origin__ == Union and len(tp.__args__) == 2 and \
+            type(None) in tp.__args__:
+        return _get_enum_type(tp.__args__[0] if tp.__args__[1] is type(None) else tp.__args__[1])
+    return tp if isinstance(tp, type) and issubclass(tp, Enum) else None
+
+
+# Scalar types whose values cannot change, so whose hashes can be cached by containers
+_immutable_types = (str, int, float, bool, Enum, dt.date, dt.time, type(None))
+
+
+def _is_immutable_type(tp) -> bool:
+    """Whether values of type hint tp are immutable, i.e. scalars, enums, dates or tuples and unions of those"""
+    if isinstance(tp, _union_types):
+        return _is_immutable_type(Union[tp.__args__])
+    if isinstance(tp, _generic_alias_types):
+        if getattr(tp, '_special', False) or tp.__origin__ not in (Union, tuple):
+            return False
+        return all(arg is Ellipsis or _is_immutable_type(arg) for arg in tp.__args__)
+    return isinstance(tp, type) and issubclass(tp, _immutable_types)
+
+
+def _build_type_matcher(tp):
+    instance_types = _get_instance_types(tp)
+    if instance_types:
+        # Plain classes and unions of them, e.g. Optional[Union[float, str]], are matched by a single isinstance
+        return lambda val: isinstance(val, instance_types)
+    if isinstance(tp, _union_types):
+        # X | Y hints are equivalent to Union[X, Y]
+        return _build_type_matcher(Union[tp.__args__])
+    if not isinstance(tp, _generic_alias_types):
+        return _never_matches
+    if getattr(tp, '_special', False):
+        return _never_matches
+    origin = tp.__origin__
+    args = tp.__args__
+    if float in args:
+        args += (int,)
+    if origin == Union:
+        if type(None) in args:
+            # Check for None directly, rather than via its own matcher
+            matcher = _get_type_matcher(Union[tuple(arg for arg in args if arg is not type(None))])
+            return lambda val: val is None or matcher(val)
+
+        matchers = tuple(_get_type_matcher(arg) for arg in args)
+        return lambda val: any(matcher(val) for matcher in matchers)
+    if origin == tuple:
+        if not args:
+            return _never_matches
+        if len(args) == 1 or args[1] == Ellipsis:
+            instance_types = _get_instance_types(args[0])
+            if instance_types:
+                # Check the elements without a Python call per element
+                return lambda val: isinstance(val, tuple) and all(map(isinstance, val, repeat(instance_types)))
+            matcher = _get_type_matcher(args[0])
+            return lambda val: isinstance(val, tuple) and all(matcher(x) for x in val)
+        else:
+            matchers = tuple(_get_type_matcher(arg) for arg in args)
+            return lambda val: isinstance(val, tuple) and len(matchers) == len(val) and \
+                all(matcher(x) for matcher, x in zip(matchers, val))
+    return _never_matches
+
+
+def _get_type_matcher(tp):
+    """A function telling whether a value matches the type hint tp as is, built once per type hint"""
+    if tp not in _type_matcher_cache:
+        _type_matcher_cache[tp] = _build_type_matcher(tp)
+
+    return _type_matcher_cache[tp]
+
+
+def _get_enum_members_by_value(enum_type: EnumMeta) -> dict:
+    """
+    Members of enum_type by their exact values, plus other strings (e.g. in a different case) once they have been
+    looked up, shared by get_enum_value, field setters and decoders
+    """
+    members_by_value = _enum_value_cache.get(enum_type)
+    if members_by_value is None:
+        members_by_value = _enum_value_cache[enum_type] = dict(enum_type._value2member_map_)
+
+    return members_by_value
+
+
+def _build_type_converter(tp):
+    convert_value = Base._Base__convert_value
+    enum_type = _get_enum_type(tp)
+    if enum_type:
+        # Strings etc. are mostly values enum members have been looked up by before, which are looked up directly
+        members_by_value = _get_enum_members_by_value(enum_type)
+
+        def convert(value):
+            try:
+                member = members_by_value.get(value)
+            except TypeError:
+                member = None
+
+            if member is None:
+                member = convert_value(tp, value)
+                if isinstance(value, str) and isinstance(member, enum_type):
+                    members_by_value[value] = member
+
+            return member
+    else:
+        def convert(value):
+            return convert_value(tp, value)
+
+    return convert
+
+
+def _get_type_converter(tp):
+    """
+    A function converting values which do not match the type hint tp as Base.__setattr__ does, built once per type hint
+    and shared by all the fields with that type
+    """
+    if tp not in _type_converter_cache:
+        _type_converter_cache[tp] = _build_type_converter(tp)
+
+    return _type_converter_cache[tp]
+
+
 def _get_is_supported_generic(arg):
     if arg in _is_supported_generic_cache:
         is_supported_generic = _is_supported_generic_cache[arg]
@@ -78,26 +285,438 @@ def _get_is_supported_generic(arg):
     return is_supported_generic
 
 
+def _build_enum_decoder(tp: EnumMeta):
+    """Decoder for enum values, which looks members up by value directly before calling the enum class"""
+    members_by_value = _get_enum_members_by_value(tp)
+
+    def decode(val):
+        try:
+            member = members_by_value.get(val)
+        except TypeError:
+            member = None
+
+        if member is None:
+            # Case insensitive matches etc. are handled by the enum's _missing_
+            member = tp(val)
+            if isinstance(val, str):
+                members_by_value[val] = member
+
+        return member
+
+    return decode
+
+
+def _build_value_decoder(tp):
+    """
+    Decoder for a non-null value of type tp, equivalent to that of dataclasses_json, or None if the type is not
+    handled here
+    """
+    if tp in global_config.decoders:
+        return global_config.decoders[tp]
+    if tp is str:
+        # Field values such as commodities, contracts and currencies repeat across many instances, so share one copy
+        return lambda val: sys.intern(val) if type(val) is str else val if isinstance(val, str) else str(val)
+    if tp in (int, float, bool):
+        return lambda val: val if isinstance(val, tp) else tp(val)
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return _build_enum_decoder(tp)
+    if isinstance(tp, type) and is_dataclass(tp):
+        # Only defer to classes which decode the same way dataclasses_json does
+        if getattr(getattr(tp, 'from_dict', None), '__func__', None) is not _from_dict:
+            return None
+        return lambda val: val if isinstance(val, tp) else tp.from_dict(val)
+
+    origin = getattr(tp, '__origin__', None)
+    args = getattr(tp, '__args__', ())
+    if origin == Union and len(args) == 2 and type(None) in args:
+        decoder = _get_value_decoder(args[0] if args[1] is type(None) else args[1])
+        return None if decoder is None else lambda val: None if val is None else decoder(val)
+    if origin == tuple and len(args) == 2 and args[1] == Ellipsis:
+        decoder = _get_value_decoder(args[0])
+        return None if decoder is None else lambda val: None if val is None else tuple(decoder(v) for v in val)
+
+    return None
+
+
+def _get_value_decoder(tp):
+    if tp not in _value_decoder_cache:
+        _value_decoder_cache[tp] = _build_value_decoder(tp)
+
+    return _value_decoder_cache[tp]
+
+
+def _build_from_dict_decoders(cls) -> Optional[Tuple[dict, Optional[dict]]]:
+    """
+    Map of JSON key to (field name, value decoder, matcher for decoded values which can be stored as is or None if all
+    can, whether None is the default held by the class) for each init field of cls, and the instance dict of a default
+    instance if instances can be built by updating a copy of it, or None if dataclasses_json should decode it
+    """
+    cls_config = getattr(cls, 'dataclass_json_config', None) or {}
+    if cls_config.get('undefined') is not None:
+        return None
+
+    decoders = {}
+    letter_cased_decoders = {}
+    for fld in fields(cls):
+        if not fld.init:
+            continue
+
+        if (fld.default is MISSING and fld.default_factory is MISSING) or isinstance(fld.type, str):
+            return None
+
+        none_is_default = fld.default is None and getattr_static(cls, fld.name, MISSING) is None
+        field_config = dict(cls_config)
+        field_config.update(fld.metadata.get('dataclasses_json', {}))
+        decoder = field_config.get('decoder', global_config.decoders.get(fld.type))
+        if decoder is not None:
+            # As per dataclasses_json, values which are already of the field type are not decoded
+            decoder = (lambda d, t: lambda val: val if type(val) is t else d(val))(decoder, fld.type)
+            # Custom decoders may return anything, so values not matching the field type are set (and coerced) as
+            # normal
+            decoder = (fld.name, decoder, _get_type_matcher(fld.type), none_is_default)
+        else:
+            decoder = _get_value_decoder(fld.type)
+            if decoder is None:
+                return None
+
+            decoder = (fld.name, decoder, None, none_is_default)
+
+        decoders[fld.name] = decoder
+        letter_case = field_config.get('letter_case')
+        if letter_case is not None:
+            letter_cased_decoders[sys.intern(letter_case(fld.name))] = decoder
+
+    decoders.update(letter_cased_decoders)
+
+    defaults = None
+    if getattr(cls.__dict__.get('__init__'), '__handles_camel_case_args__', False) and \
+            not hasattr(cls, '__post_init__') and all(f.default_factory is MISSING for f in fields(cls)):
+        # The generated __init__ just sets each field, so a copy of the (already coerced) defaults can be updated
+        # with the decoded values in one go instead
+        defaults = dict(cls().__dict__)
+
+    return decoders, defaults
+
+
+def _from_dict(cls, kvs: dict, *, infer_missing=False):
+    """
+    dataclasses_json from_dict, with the key mapping and decoder for each field worked out once per class rather than
+    on every call
+    """
+    if cls not in _from_dict_decoders_cache:
+        _from_dict_decoders_cache[cls] = _build_from_dict_decoders(cls)
+
+    decoders = _from_dict_decoders_cache[cls]
+    if decoders is None or infer_missing:
+        return _decode_dataclass(cls, kvs, infer_missing)
+
+    if isinstance(kvs, cls):
+        return kvs
+
+    decoders, defaults = decoders
+    if defaults is None:
+        init_kwargs = {}
+        for key, value in kvs.items():
+            decoder = decoders.get(key)
+            if decoder is not None:
+                name, decode = decoder[:2]
+                init_kwargs[name] = None if value is None else decode(value)
+
+        return cls(**init_kwargs)
+
+    values = dict(defaults)
+    set_values = None
+    for key, value in kvs.items():
+        decoder = decoders.get(key)
+        if decoder is not None:
+            name, decode, matches, none_is_default = decoder
+            if value is None:
+                if none_is_default:
+                    # Leave the instance to pick up None from the class, as the generated __init__ does
+                    values.pop(name, None)
+                    continue
+            else:
+                value = decode(value)
+
+            if matches is None or matches(value):
+                values[name] = value
+            else:
+                if set_values is None:
+                    set_values = {}
+                set_values[name] = value
+
+    ret = cls.__new__(cls)
+    ret.__dict__.update(values)
+    if set_values:
+        for name, value in set_values.items():
+            setattr(ret, name, value)
+
+    return ret
+
+
+def _build_to_dict_encoders(cls) -> Optional[Tuple[Tuple[str, str, Optional[Callable], Optional[Callable]], ...]]:
+    """
+    (field name, JSON key, encoder, exclude predicate) for each field of cls, or None if dataclasses_json should encode
+    it
+    """
+    cls_config = getattr(cls, 'dataclass_json_config', None) or {}
+    if cls_config.get('undefined') is not None:
+        return None
+
+    encoders = []
+    for name, override in _user_overrides_or_exts(cls).items():
+        # The same keys (e.g. assetClass) are used by many classes, so share one copy of each
+        key = sys.intern(override.letter_case(name)) if override.letter_case is not None else name
+        encoders.append((name, key, override.encoder, override.exclude))
+
+    if len(set(e[1] for e in encoders)) != len(encoders):
+        # Let dataclasses_json report fields mapping to the same key
+        return None
+
+    return tuple(encoders)
+
+
+def _encode_value(value, encode_json: bool):
+    # As per dataclasses_json _asdict, but without the deep copy of immutable scalars, and with nested generated
+    # classes encoded via their cached encoders
+    if value is None or value.__class__ in (str, float, int, bool):
+        return value
+    if isinstance(value, Base) and getattr(value.__class__, 'to_dict', None) is _to_dict:
+        return _to_dict(value, encode_json)
+    if isinstance(value, tuple):
+        return [_encode_value(v, encode_json) for v in value]
+    if isinstance(value, Enum) and value.__class__ not in global_config.encoders:
+        return value
+
+    return _asdict(value, encode_json=encode_json)
+
+
+def _to_dict(self, encode_json=False) -> dict:
+    """
+    dataclasses_json to_dict, with the key, encoder and exclude predicate for each field worked out once per class
+    rather than on every call
+    """
+    cls = self.__class__
+    if cls not in _to_dict_encoders_cache:
+        _to_dict_encoders_cache[cls] = _build_to_dict_encoders(cls)
+
+    encoders = _to_dict_encoders_cache[cls]
+    if encoders is None:
+        return _asdict(self, encode_json=encode_json)
+
+    ret = {}
+    for name, key, encoder, exclude in encoders:
+        value = getattr(self, name)
+        if encoder is None:
+            value = _encode_value(value, encode_json)
+
+        if exclude is not None and exclude(value):
+            continue
+
+        if encoder is not None:
+            value = encoder(value)
+
+        ret[key] = _encode_json_type(value) if encode_json else value
+
+    return ret
+
+
+def _normalise_kwargs(cls, kwargs: dict, other_args) -> dict:
+    """Map camelCase etc. argument names to field names, checking the same field is not also in other_args"""
+    arg_names = _arg_names_cache.get(cls)
+    if arg_names is None:
+        arg_names = _arg_names_cache[cls] = {}
+
+    normalised_kwargs = {}
+
+    for arg, value in kwargs.items():
+        # (snake_case name, field name) for each argument name, worked out once per class
+        names = arg_names.get(arg)
+        if names is None:
+            snake_case_arg = arg if arg.isupper() else _get_underscore(arg)
+            names = arg_names[arg] = (snake_case_arg, cls._field_mappings().get(snake_case_arg, snake_case_arg))
+
+        snake_case_arg, name = names
+        if snake_case_arg != arg and (snake_case_arg in kwargs or snake_case_arg in other_args):
+            raise ValueError('{} and {} both specified'.format(arg, snake_case_arg))
+
+        normalised_kwargs[name] = value
+
+    return normalised_kwargs
+
+
+def _make_init(cls, init):
+    """
+    An __init__ equivalent to handle_camel_case_args wrapping the dataclass generated init, which stores values with
+    object.__setattr__ rather than setting each via Base.__setattr__ (and without touching __dict__, so CPython can keep
+    the values inline without allocating an instance dict). Defaults which are also the class attribute
+    (e.g. None) are not stored on the instance at all, so sparsely populated instances have small instance dicts, and
+    other (already coerced) defaults are stored as is. Field names are taken as keyword arguments directly, and any
+    other (e.g. camelCase) names are normalised and passed to init. Instances of subclasses (which may override
+    __setattr__ or fields) are also initialised via init. Returns None if cls needs anything else done on construction
+    """
+    if not is_dataclass(cls) or cls.__dataclass_params__.frozen or hasattr(cls, '__post_init__') or \
+            '__slots__' in cls.__dict__ or any(f.default_factory is not MISSING for f in fields(cls)) or \
+            cls.__setattr__ is not Base.__setattr__:
+        return None
+
+    # Make sure there are no init-only variables etc. which fields() does not include
+    init_fields = tuple(f for f in fields(cls) if f.init)
+    arg_names = ('self',) + tuple(f.name for f in init_fields)
+    if init.__code__.co_varnames[:init.__code__.co_argcount] != arg_names or init.__code__.co_kwonlyargcount or \
+            any(f.name in ('self', '_setattr', 'kwargs', 'isinstance', 'type', '_cls') for f in init_fields):
+        return None
+
+    defaults = {f.name: f.default for f in init_fields}
+    required = frozenset(f.name for f in init_fields if f.default is MISSING)
+
+    def init_with_kwargs(self, args_by_name: dict, kwargs: dict):
+        explicit_args = {n: v for n, v in args_by_name.items() if v is not defaults[n]}
+        normalised_kwargs = _normalise_kwargs(cls, kwargs, explicit_args)
+        if type(self) is cls and defaults.keys() >= normalised_kwargs.keys() and \
+                required <= explicit_args.keys() | normalised_kwargs.keys():
+            return namespace['__init__'](self, **explicit_args, **normalised_kwargs)
+
+        # Let the dataclass __init__ set values for subclasses, and report missing or unexpected arguments
+        return init(self, **explicit_args, **normalised_kwargs)
+
+    namespace = {'_init_with_kwargs': init_with_kwargs, '_missing': MISSING, '_setattr': __setattr__, '_cls': cls}
+    args = []
+    required_checks = []
+    lines = []
+    for idx, fld in enumerate(init_fields):
+        _, _, matches, convert, in_instance_dict = cls._Base__resolve_setattr_field(fld.name)
+        if not in_instance_dict:
+            # Fields shadowed by a property etc. must be set (defaults included) through it
+            return None
+
+        # Coerce the value as Base.__setattr__ would, without going through attribute assignment (a new instance has
+        # no cached hash to invalidate)
+        namespace[f'_convert_{idx}'] = convert
+        instance_types = _get_instance_types(fld.type)
+        if instance_types:
+            # Inline the isinstance check, rather than calling the field's type matcher
+            namespace[f'_types_{idx}'] = instance_types
+            match = f'isinstance({fld.name}, _types_{idx})'
+        else:
+            namespace[f'_matches_{idx}'] = matches
+            match = f'_matches_{idx}({fld.name})'
+
+        set_value = f'_setattr(self, {fld.name!r}, {fld.name} if {match} else _convert_{idx}({fld.name}))'
+
+        if fld.default is MISSING:
+            # Required arguments may be given by camelCase name, so are checked for in the body
+            args.append(f'{fld.name}=_missing')
+            required_checks.append(f' or {fld.name} is _missing')
+            lines.append(f'    {set_value}')
+            continue
+
+        coerced_default = cls._Base__coerce_value(fld.type, fld.default)
+        namespace[f'_default_{idx}'] = fld.default
+        args.append(f'{fld.name}=_default_{idx}')
+        if coerced_default is fld.default and getattr_static(cls, fld.name, MISSING) is fld.default:
+            lines.append(f'    if {fld.name} is not _default_{idx}:\n'
+                         f'        {set_value}')
+        else:
+            namespace[f'_coerced_default_{idx}'] = coerced_default
+            lines.append(f'    if {fld.name} is _default_{idx}:\n'
+                         f'        _setattr(self, {fld.name!r}, _coerced_default_{idx})\n'
+                         f'    else:\n'
+                         f'        {set_value}')
+
+    args_by_name = ', '.join(f'{f.name!r}: {f.name}' for f in init_fields)
+    lines.insert(0, f'    if kwargs{"".join(required_checks)} or type(self) is not _cls:\n'
+                    f'        return _init_with_kwargs(self, {{{args_by_name}}}, kwargs)')
+    src = f'def __init__(self, {"".join(a + ", " for a in args)}**kwargs):\n' + '\n'.join(lines) + '\n'
+    exec(compile(src, f'<generated __init__ of {cls.__qualname__}>', 'exec'), namespace)
+    return namespace['__init__']
+
+
+def _make_cached_hash(cls, hash_fn):
+    """
+    A __hash__ which caches the result of hash_fn on the instance, if all the fields of cls are immutable. Base
+    invalidates the cached hash when a field is set
+    """
+    immutable = None
+
+    def __hash__(self):
+        nonlocal immutable
+        if immutable is None:
+            immutable = all(not isinstance(f.type, str) and _is_immutable_type(f.type) for f in fields(cls))
+
+        # Values of other fields (e.g. legs) can be changed without us knowing, so do not cache their hash
+        if not immutable:
+            return hash_fn(self)
+
+        # Go via attribute access, as touching __dict__ makes CPython allocate a dict for the instance's values
+        try:
+            return __getattribute__(self, '_Base__hash')
+        except AttributeError:
+            ret = hash_fn(self)
+            __setattr__(self, '_Base__hash', ret)
+            return ret
+
+    return update_wrapper(wrapper=__hash__, wrapped=hash_fn)
+
+
+def _getstate_without_hash(self):
+    # Hashes of strings differ between processes, so never pickle a cached hash
+    state = self.__dict__
+    if '_Base__hash' in state:
+        state = dict(state)
+        del state['_Base__hash']
+
+    return state
+
+
 def handle_camel_case_args(cls):
     init = cls.__init__
+    generated_init = None
+    plain_args = None
 
     def wrapper(self, *args, **kwargs):
-        normalised_kwargs = {}
-
-        for arg, value in kwargs.items():
-            if not arg.isupper():
-                snake_case_arg = _get_underscore(arg)
-                if snake_case_arg != arg and snake_case_arg in kwargs:
-                    raise ValueError('{} and {} both specified'.format(arg, snake_case_arg))
+        nonlocal generated_init, plain_args
+        if plain_args is None and generated_init is None:
+            # Once the class is fully defined, replace this wrapper with a generated __init__ where possible
+            generated_init = _make_init(cls, init)
+            if generated_init is not None:
+                cls.__init__ = update_wrapper(wrapper=generated_init, wrapped=init)
+                cls.__init__.__handles_camel_case_args__ = True
+            else:
+                # Argument names which normalisation leaves unchanged
+                field_mappings = cls._field_mappings()
+                plain_args = frozenset(n for n in cls._fields_by_name()
+                                       if (n.isupper() or _get_underscore(n) == n) and field_mappings.get(n, n) == n)
 
-                arg = snake_case_arg
+        if generated_init is not None:
+            return generated_init(self, *args, **kwargs)
 
-            arg = cls._field_mappings().get(arg, arg)
-            normalised_kwargs[arg] = value
+        if plain_args.issuperset(kwargs):
+            return init(self, *args, **kwargs)
 
-        return init(self, *args, **normalised_kwargs)
+        return init(self, *args, **_normalise_kwargs(cls, kwargs, ()))
 
     cls.__init__ = update_wrapper(wrapper=wrapper, wrapped=init)
+    cls.__init__.__handles_camel_case_args__ = True
+
+    if getattr(cls.__dict__.get('from_dict'), '__func__', None) is DataClassJsonMixin.from_dict.__func__:
+        cls.from_dict = classmethod(_from_dict)
+
+    if cls.__dict__.get('to_dict') is DataClassJsonMixin.to_dict:
+        cls.to_dict = _to_dict
+
+    for mapped_name, field_name in cls._field_mappings().items():
+        if field_name == mapped_name + '_' and getattr_static(cls, mapped_name, MISSING) is MISSING:
+            # Fields named for disallowed names, e.g. type_ for type, are mostly read by the mapped name, so give the
+            # class an alias for it, rather than going through Base.__getattr__ each time
+            setattr(cls, mapped_name, property(attrgetter(field_name)))
+
+    getstate = getattr(cls, '__getstate__', None)
+    if cls.__dict__.get('__hash__') is not None and '__slots__' not in cls.__dict__ and \
+            getstate in (None, getattr(object, '__getstate__', None), _getstate_without_hash):
+        cls.__hash__ = _make_cached_hash(cls, cls.__dict__['__hash__'])
+        cls.__getstate__ = _getstate_without_hash
+        cls._Base__caches_hash = True
 
     return cls
 
@@ -112,6 +731,8 @@ name_metadata = config(exclude=exclude_always)
 
 class RiskKey(namedtuple('RiskKey', ('provider', 'date', 'market', 'params', 'scenario', 'risk_measure'))):
 
+    __slots__ = ()
+
     @property
     def ex_measure(self):
         from gs_quant.target.common import RiskRequestParameters
@@ -137,9 +758,17 @@ class EnumBase:
 
     @classmethod
     def _missing_(cls: EnumMeta, key):
+        members_by_lower_value = _enum_members_by_lower_value_cache.get(cls)
+        if members_by_lower_value is None:
+            members_by_lower_value = {}
+            for m in cls.__members__.values():
+                if isinstance(m.value, str):
+                    members_by_lower_value.setdefault(m.value.lower(), m)
+            _enum_members_by_lower_value_cache[cls] = members_by_lower_value
+
         if not isinstance(key, str):
             key = str(key)
-        return next((m for m in cls.__members__.values() if m.value.lower() == key.lower()), None)
+        return members_by_lower_value.get(key.lower())
 
     def __reduce_ex__(self, protocol):
         return self.__class__, (self.value,)
@@ -156,18 +785,70 @@ class EnumBase:
 
 class HashableDict(dict):
 
+    __hash = None
+
     @staticmethod
-    def hashables(in_dict) -> Tuple:
-        hashables = []
-        for it in in_dict.items():
-            if isinstance(it[1], dict):
-                hashables.append((it[0], HashableDict.hashables(it[1])))
-            else:
-                hashables.append(it)
-        return tuple(hashables)
+    def hashables(in_dict) -> FrozenSet:
+        # Equal dicts must hash equally regardless of insertion order, so use (C-level) frozenset hashing
+        return frozenset((k, HashableDict.hashables(v)) if isinstance(v, dict) else (k, v) for k, v in in_dict.items())
 
     def __hash__(self):
-        return hash(HashableDict.hashables(self))
+        if self.__hash is not None:
+            return self.__hash
+
+        # Values such as nested dicts and Base objects can be changed without us knowing, so only cache the hash of
+        # dicts of immutable scalars
+        if not all(isinstance(v, _immutable_types) for v in self.values()):
+            return hash(HashableDict.hashables(self))
+
+        ret = hash(frozenset(self.items()))
+        __setattr__(self, '_HashableDict__hash', ret)
+        return ret
+
+    def __invalidate_hash(self):
+        if self.__hash is not None:
+            __setattr__(self, '_HashableDict__hash', None)
+
+    def __getstate__(self):
+        # Hashes of strings differ between processes, so never pickle (or copy) a cached hash
+        state = self.__dict__
+        if '_HashableDict__hash' in state:
+            state = dict(state)
+            del state['_HashableDict__hash']
+
+        return state
+
+    def __setitem__(self, key, value):
+        self.__invalidate_hash()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.__invalidate_hash()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        self.__invalidate_hash()
+        super().clear()
+
+    def pop(self, *args):
+        self.__invalidate_hash()
+        return super().pop(*args)
+
+    def popitem(self):
+        self.__invalidate_hash()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.__invalidate_hash()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.__invalidate_hash()
+        super().update(*args, **kwargs)
 
 
 class DictBase(HashableDict):
@@ -179,15 +860,14 @@ class DictBase(HashableDict):
             if invalid_arg is not None:
                 raise AttributeError(f"'{self.__class__.__name__}' has no attribute '{invalid_arg}'")
 
-        super().__init__(*args, **{camelize(k, uppercase_first_letter=False): v for k, v in kwargs.items()
-                                   if v is not None})
+        super().__init__(*args, **{_get_camelize(k): v for k, v in kwargs.items() if v is not None})
 
     def __getitem__(self, item):
-        return super().__getitem__(camelize(item, uppercase_first_letter=False))
+        return super().__getitem__(_get_camelize(item))
 
     def __setitem__(self, key, value):
         if value is not None:
-            return super().__setitem__(camelize(key, uppercase_first_letter=False), value)
+            return super().__setitem__(_get_camelize(key), value)
 
     def __getattr__(self, item):
         if self._PROPERTIES:
@@ -199,7 +879,7 @@ class DictBase(HashableDict):
         raise AttributeError(f"'{self.__class__.__name__}' has no attribute '{item}'")
 
     def __setattr__(self, key, value):
-        if key in dir(self):
+        if key in _get_class_dir(type(self)) or key in self.__dict__:
             return super().__setattr__(key, value)
         elif self._PROPERTIES and _get_underscore(key) not in self._PROPERTIES:
             raise AttributeError(f"'{self.__class__.__name__}' has no attribute '{key}'")
@@ -214,18 +894,42 @@ class DictBase(HashableDict):
 class Base(ABC):
     """The base class for all generated classes"""
 
+    # Subclasses get an instance dict unless they declare __slots__ themselves
+    __slots__ = ()
+
     __fields_by_name = None
     __field_mappings = None
+    __as_dict_keys = None
+    __setattr_fields = None
+    # Set (for subclasses too) by handle_camel_case_args when instances may cache their hash
+    __caches_hash = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each class caches its own fields, rather than picking up those of a parent which has been used already
+        cls.__fields_by_name = None
+        cls.__field_mappings = None
+        cls.__as_dict_keys = None
+        cls.__setattr_fields = None
 
     def __getattr__(self, item):
-        fields_by_name = __getattribute__(self, '_fields_by_name')()
+        # Private and dunder lookups (copy, pickle, IPython etc.) never map to fields
+        if item.startswith('_'):
+            return __getattribute__(self, item)
+
+        cls = type(self)
+        fields_by_name = cls.__fields_by_name
+        if fields_by_name is None:
+            fields_by_name = cls._fields_by_name()
 
-        if item.startswith('_') or item in fields_by_name:
+        if item in fields_by_name:
             return __getattribute__(self, item)
 
         # Handle setting via camelCase names (legacy behaviour) and field mappings from disallowed names
         snake_case_item = _get_underscore(item)
-        field_mappings = __getattribute__(self, '_field_mappings')()
+        field_mappings = cls.__field_mappings
+        if field_mappings is None:
+            field_mappings = cls._field_mappings()
         snake_case_item = field_mappings.get(snake_case_item, snake_case_item)
 
         try:
@@ -234,19 +938,72 @@ class Base(ABC):
             return __getattribute__(self, item)
 
     def __setattr__(self, key, value):
-        # Handle setting via camelCase names (legacy behaviour)
-        snake_case_key = _get_underscore(key)
-        snake_case_key = self._field_mappings().get(snake_case_key, snake_case_key)
-        fld = self._fields_by_name().get(snake_case_key)
+        cls = type(self)
+        setattr_fields = cls.__setattr_fields
+        if setattr_fields is None:
+            setattr_fields = cls.__setattr_fields = {}
+
+        # The attribute name and field for each key set, resolved once per class
+        setattr_field = setattr_fields.get(key)
+        if setattr_field is None:
+            setattr_field = setattr_fields[key] = cls.__resolve_setattr_field(key)
 
+        name, fld, matches, convert, in_instance_dict = setattr_field
         if fld:
             if not fld.init:
                 raise ValueError(f'{key} cannot be set')
 
-            key = snake_case_key
-            value = self.__coerce_value(fld.type, value)
+            if not matches(value):
+                value = convert(value)
+
+            if in_instance_dict:
+                instance_dict = self.__dict__
+                if cls.__caches_hash:
+                    # Re-setting the current value (e.g. when copying values across) leaves any cached hash valid
+                    if instance_dict.get(name, MISSING) is value:
+                        return
+
+                    instance_dict.pop('_Base__hash', None)
+
+                instance_dict[name] = value
+                return
+
+            if cls.__caches_hash:
+                self.__dict__.pop('_Base__hash', None)
+
+        __setattr__(self, name, value)
+
+    @classmethod
+    def __resolve_setattr_field(cls, key) -> Tuple[str, Optional[Field], Optional[Callable[[object], bool]],
+                                                   Optional[Callable[[object], object]], bool]:
+        # Handle setting via camelCase names (legacy behaviour)
+        snake_case_key = _get_underscore(key)
+        snake_case_key = cls._field_mappings().get(snake_case_key, snake_case_key)
+        fld = cls._fields_by_name().get(snake_case_key)
+        if not fld:
+            return key, None, None, None, False
+
+        # Keep the field's type matcher and converter too, rather than hashing its type hint to look them up on each
+        # set
+        typ = fld.type
+        # Values can be stored straight into the instance dict unless a data descriptor (e.g. a property) shadows the
+        # field
+        in_instance_dict = not hasattr(type(getattr_static(cls, snake_case_key, None)), '__set__')
+        return snake_case_key, fld, _get_type_matcher(typ), _get_type_converter(typ), in_instance_dict
+
+    def __copy__(self):
+        # Shallow copy the instance dict directly, rather than via the generic __reduce_ex__ protocol
+        cls = self.__class__
+        ret = cls.__new__(cls)
+        state = getattr(self, '__dict__', None)
+        if state:
+            ret.__dict__.update(state)
+
+        for slot in _get_slot_names(cls):
+            if hasattr(self, slot):
+                __setattr__(ret, slot, __getattribute__(self, slot))
 
-        __setattr__(self, key, value)
+        return ret
 
     def __repr__(self):
         if self.name is not None:
@@ -254,38 +1011,15 @@ class Base(ABC):
 
         return super().__repr__()
 
-    @classmethod
-    def __is_type_match(cls, tp, val):
-        if sys.version_info >= (3, 9):
-            from types import GenericAlias
-            is_generic_alias = isinstance(tp, (typing._GenericAlias, GenericAlias))
-        else:
-            is_generic_alias = isinstance(tp, typing._GenericAlias)
-        if not is_generic_alias:
-            # Do not convert Enums to strings
-            is_enum_to_str = isinstance(val, Enum) and tp == str
-            return isinstance(tp, type) and (isinstance(val, tp) or is_enum_to_str)
-        if getattr(tp, '_special', False):
-            return False
-        origin = tp.__origin__
-        args = tp.__args__
-        if float in args:
-            args += (int,)
-        if origin == Union:
-            return any(cls.__is_type_match(arg, val) for arg in args)
-        if origin == tuple:
-            if not isinstance(val, tuple) or not args:
-                return False
-            if len(args) == 1 or args[1] == Ellipsis:
-                return all(cls.__is_type_match(args[0], x) for x in val)
-            else:
-                return len(args) == len(val) and all(cls.__is_type_match(arg, x) for arg, x in zip(args, val))
-        return False
-
     @classmethod
     def __coerce_value(cls, typ: type, value):
-        if cls.__is_type_match(typ, value):
+        if _get_type_matcher(typ)(value):
             return value
+        return cls.__convert_value(typ, value)
+
+    @classmethod
+    def __convert_value(cls, typ: type, value):
+        # Convert a value which does not match typ as is
         if isinstance(value, np.generic):
             # Handle numpy types
             return value.item()
@@ -342,7 +1076,18 @@ class Base(ABC):
             >>>
             >>> new_cap = cap.clone(cap_rate=0.01)
         """
-        return replace(self, **kwargs)
+        field_mappings = self._field_mappings()
+        fields_by_name = self._fields_by_name()
+        if any(field_mappings.get(_get_underscore(k), _get_underscore(k)) not in fields_by_name for k in kwargs):
+            # Let replace() deal with init-only variables and report unknown arguments
+            return replace(self, **kwargs)
+
+        # Copy and set just the overridden values, rather than re-constructing and coercing every field
+        ret = copy.copy(self)
+        for key, value in kwargs.items():
+            setattr(ret, key, value)
+
+        return ret
 
     @classmethod
     def properties(cls) -> set:
@@ -361,20 +1106,44 @@ class Base(ABC):
         # asdict() does not convert values or case of the keys or do name mappings
 
         ret = {}
-        field_mappings = {v: k for k, v in self._field_mappings().items()}
-
-        for key in self.__fields_by_name.keys():
-            value = __getattribute__(self, key)
-            key = field_mappings.get(key, key)
+        key_idx = 2 if as_camel_case else 1
+        instance_dict = getattr(self, '__dict__', None) or {}
+
+        for keys in self._as_dict_keys():
+            if keys[3]:
+                # Read set fields straight from the instance dict, rather than via attribute lookup
+                try:
+                    value = instance_dict[keys[0]]
+                except KeyError:
+                    value = __getattribute__(self, keys[0])
+            else:
+                value = __getattribute__(self, keys[0])
 
             if value is not None:
-                if as_camel_case:
-                    key = camelize(key, uppercase_first_letter=False)
-
-                ret[key] = value
+                ret[keys[key_idx]] = value
 
         return ret
 
+    @classmethod
+    def _as_dict_keys(cls) -> Tuple[Tuple[str, str, str, bool], ...]:
+        """
+        (field name, property name, camelCase property name, whether the value is held in the instance dict) for each
+        field, as used by as_dict
+        """
+        if cls.__as_dict_keys is None:
+            field_mappings = {v: k for k, v in cls._field_mappings().items()}
+            as_dict_keys = []
+
+            for name, fld in cls._fields_by_name().items():
+                key = field_mappings.get(name, name)
+                # Fields not set on init live on the class, and data descriptors take precedence over the instance dict
+                in_instance_dict = fld.init and not hasattr(type(getattr_static(cls, name, None)), '__set__')
+                as_dict_keys.append((name, key, _get_camelize(key), in_instance_dict))
+
+            cls.__as_dict_keys = tuple(as_dict_keys)
+
+        return cls.__as_dict_keys
+
     @classmethod
     def default_instance(cls):
         """
@@ -392,14 +1161,29 @@ class Base(ABC):
         if not isinstance(instance, type(self)):
             raise ValueError('Can only use from_instance with an object of the same type')
 
-        for fld in fields(self.__class__):
-            if fld.init:
-                __setattr__(self, fld.name, __getattribute__(instance, fld.name))
+        cls = type(self)
+        fields_by_name = cls._fields_by_name()
+        values = {}
+        for name, _, _, in_instance_dict in cls._as_dict_keys():
+            # Fields always resolve (to the instance or class value), so getattr (quicker than calling
+            # object.__getattribute__) will not fall back to __getattr__
+            if in_instance_dict:
+                values[name] = getattr(instance, name)
+            elif fields_by_name[name].init:
+                __setattr__(self, name, getattr(instance, name))
+
+        # Store the values in one go, rather than setting each field in turn
+        instance_dict = self.__dict__
+        if self.__caches_hash:
+            instance_dict.pop('_Base__hash', None)
+
+        instance_dict.update(values)
 
 
 @dataclass_json
 @dataclass
 class Priceable(Base):
+    __slots__ = ()
 
     def resolve(self, in_place: bool = True):
         """
@@ -542,6 +1326,12 @@ class RiskMeasureParameter(Base, ABC):
 class InstrumentBase(Base, ABC):
     quantity_: InitVar[float] = field(default=1, init=False)
 
+    # Unset until an instrument is resolved or given metadata, read from here rather than by catching AttributeError
+    __resolution_key = None
+    __unresolved = None
+    # A plain attribute (set on instances via Base.__setattr__), rather than a property over a private one
+    metadata = None
+
     @property
     @abstractmethod
     def provider(self):
@@ -553,28 +1343,11 @@ class InstrumentBase(Base, ABC):
 
     @property
     def resolution_key(self) -> Optional[RiskKey]:
-        try:
-            return self.__resolution_key
-        except AttributeError:
-            return None
+        return self.__resolution_key
 
     @property
     def unresolved(self):
-        try:
-            return self.__unresolved
-        except AttributeError:
-            return None
-
-    @property
-    def metadata(self):
-        try:
-            return self.__metadata
-        except AttributeError:
-            return None
-
-    @metadata.setter
-    def metadata(self, value):
-        self.__metadata = value
+        return self.__unresolved
 
     def from_instance(self, instance):
         self.__resolution_key = None
@@ -593,9 +1366,12 @@ class InstrumentBase(Base, ABC):
 
     def clone(self, **kwargs):
         new_instrument = super().clone(**kwargs)
-        new_instrument.__unresolved = self.unresolved
-        new_instrument.metadata = self.metadata
-        new_instrument.__resolution_key = self.resolution_key
+        # Unset values are left to the class defaults, rather than stored on each clone
+        for name in ('_InstrumentBase__unresolved', 'metadata', '_InstrumentBase__resolution_key'):
+            value = getattr(self, name)
+            if value is not None or name in new_instrument.__dict__:
+                __setattr__(new_instrument, name, value)
+
         return new_instrument
 
 
@@ -627,6 +1403,8 @@ class Market(ABC):
 
 class Sentinel:
 
+    __slots__ = ('__name',)
+
     def __init__(self, name: str):
         self.__name = name
 
@@ -645,6 +1423,17 @@ class CustomComments(Base, ABC):
 
 
 def get_enum_value(enum_type: EnumMeta, value: Union[EnumBase, str]):
+    # Check for the common cases by identity first, as comparing enum members to None and isinstance checks against
+    # enum classes are comparatively slow
+    if value is None or value.__class__ is enum_type:
+        return value
+
+    members_by_value = _get_enum_members_by_value(enum_type)
+    try:
+        return members_by_value[value]
+    except (KeyError, TypeError):
+        pass
+
     if value in (None,):
         return None
 
@@ -656,6 +1445,9 @@ def get_enum_value(enum_type: EnumMeta, value: Union[EnumBase, str]):
     except ValueError:
         _logger.warning('Setting value to {}, which is not a valid entry in {}'.format(value, enum_type))
         enum_value = value
+    else:
+        if isinstance(value, str):
+            members_by_value[value] = enum_value
 
     return enum_value
 
@@ -186,6 +186,13 @@ def date_range(begin: Union[int, dt.date],
                 if prev > end:
                     raise ValueError('begin must be <= end')
 
+                busdaycal = GsCalendar.get(calendars).business_day_calendar(week_mask)
+                if type(prev) is dt.date and type(end) is dt.date and np.is_busday(prev, busdaycal=busdaycal):
+                    # Filter the whole range at once, rather than stepping forward one business day at a time
+                    days = np.arange(np.datetime64(prev, 'D'), np.datetime64(end, 'D') + 1)
+                    yield from days[np.is_busday(days, busdaycal=busdaycal)].astype(dt.date)
+                    return
+
                 while prev <= end:
                     yield prev
                     prev = business_day_offset(prev, 1, calendars=calendars, week_mask=week_mask)
@@ -53,8 +53,9 @@ class Instrument(PriceableImpl, InstrumentBase):
             cls.__instrument_mappings[(AssetClass.Cash, AssetType.Currency)] = instrument_.Forward
 
             for clazz in instrument_classes:
-                instrument = clazz.default_instance()
-                cls.__instrument_mappings[(instrument.asset_class, instrument.type)] = clazz
+                # asset_class and type_ are fields set by the class (not on init), so read them without building an
+                # instance of each class
+                cls.__instrument_mappings[(clazz.asset_class, clazz.type_)] = clazz
 
         return cls.__instrument_mappings
 
@@ -14,8 +14,10 @@ specific language governing permissions and limitations
 under the License.
 """
 import datetime as dt
+import functools
 import pandas as pd
 import re
+import sys
 from typing import Optional, Union, Iterable, Dict, Tuple, Any
 
 from dataclasses_json import config
@@ -32,20 +34,46 @@ DateOrDateTime = Union[dt.date, dt.datetime]
 
 
 def encode_date_or_str(value: Optional[Union[str, dt.date]]) -> Optional[str]:
+    if type(value) is dt.date:
+        return _encode_date(value)
+
     return value.isoformat() if isinstance(value, dt.date) else value
 
 
+# The same dates recur many times over in large portfolios, so cache their ISO strings too (and share one copy of each)
+@functools.lru_cache(maxsize=8192)
+def _encode_date(value: dt.date) -> str:
+    return value.isoformat()
+
+
 def decode_optional_date(value: Optional[str]) -> Optional[dt.date]:
     # from dataclasses-json 0.6.5 onwards the global config for type T will be applied to Optional[T]
     # So this decoder would become redundant, to allow any version we simply return if it's already a date
     if value is None or isinstance(value, dt.date):
         return value
     elif isinstance(value, str):
-        return dt.datetime.strptime(value, '%Y-%m-%d').date()
+        return _decode_iso_date_str(value)
 
     raise ValueError(f'Cannot convert {value} to date')
 
 
+# The same date strings recur many times over in large payloads, so cache the parsed values (dates are immutable)
+@functools.lru_cache(maxsize=8192)
+def _decode_iso_date_str(value: str) -> dt.date:
+    return _parse_iso_date(value) or dt.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _parse_iso_date(value: str) -> Optional[dt.date]:
+    # date.fromisoformat is many times faster than strptime, but only handles the zero-padded 'YYYY-MM-DD' form
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return dt.date.fromisoformat(value)
+        except ValueError:
+            pass
+
+    return None
+
+
 def decode_optional_time(value: Optional[str]) -> Optional[dt.time]:
     # from dataclasses-json 0.6.5 onwards the global config for type T will be applied to Optional[T]
     # So this decoder would become redundant, to allow any version we simply return if it's already a time
@@ -123,19 +151,28 @@ def decode_date_or_str(value: Union[dt.date, float, str]) -> Optional[Union[dt.d
             value -= 1  # Excel leap year bug, 1900 is not a leap year!
         return (dt.datetime(1899, 12, 31) + dt.timedelta(days=value)).date()
     elif isinstance(value, str):
-        # Try the supported string date formats
-        for fmt in __valid_date_formats:
-            try:
-                return dt.datetime.strptime(value, fmt).date()
-            except ValueError:
-                pass
-
-        # Assume it's a tenor
-        return value
+        return _decode_date_str(value)
 
     raise TypeError(f'Cannot convert {value} to date')
 
 
+@functools.lru_cache(maxsize=8192)
+def _decode_date_str(value: str) -> Union[dt.date, str]:
+    iso_date = _parse_iso_date(value)
+    if iso_date is not None:
+        return iso_date
+
+    # Try the supported string date formats
+    for fmt in __valid_date_formats:
+        try:
+            return dt.datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+
+    # Assume it's a tenor
+    return value
+
+
 def encode_datetime(value: Optional[dt.datetime]) -> Optional[str]:
     if value is None:
         return value
@@ -155,17 +192,22 @@ def decode_datetime(value: Optional[Union[int, str]]) -> Optional[dt.datetime]:
     if isinstance(value, int):
         return dt.datetime.fromtimestamp(value / 1000)
     elif isinstance(value, str):
-        matcher = re.search('\\.([0-9]*)Z$', value)
-        if matcher:
-            sub_seconds = matcher.group(1)
-            if len(sub_seconds) > 6:
-                value = re.sub(matcher.re, '.{}Z'.format(sub_seconds[:6]), value)
-
-        return isoparse(value)
+        return _decode_datetime_str(value)
 
     raise TypeError(f'Cannot convert {value} to datetime')
 
 
+@functools.lru_cache(maxsize=8192)
+def _decode_datetime_str(value: str) -> dt.datetime:
+    matcher = re.search('\\.([0-9]*)Z$', value)
+    if matcher:
+        sub_seconds = matcher.group(1)
+        if len(sub_seconds) > 6:
+            value = re.sub(matcher.re, '.{}Z'.format(sub_seconds[:6]), value)
+
+    return isoparse(value)
+
+
 def decode_float_or_str(value: Optional[Union[float, int, str]]) -> Optional[Union[float, str]]:
     if value is None:
         return value
@@ -177,8 +219,8 @@ def decode_float_or_str(value: Optional[Union[float, int, str]]) -> Optional[Uni
         try:
             return float(value)
         except ValueError:
-            # Assume it's a strike or similar, e.g. 'ATM'
-            return value
+            # Assume it's a strike or similar, e.g. 'ATM', which are shared by many instruments
+            return sys.intern(value) if type(value) is str else value
 
     raise TypeError(f'Cannot convert {value} to float')
 
@@ -14,15 +14,17 @@ specific language governing permissions and limitations
 under the License.
 """
 import asyncio
+import copy
 import datetime as dt
 import logging
 import sys
 import weakref
 from abc import ABCMeta
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from inspect import signature
 from itertools import zip_longest, takewhile
-from typing import Optional, Union, Type
+from typing import Iterable, List, Optional, Union, Type
 
 from tqdm import tqdm
 
@@ -45,6 +47,14 @@ _logger = logging.getLogger(__name__)
 CacheResult = Union[DataFrameWithInfo, FloatWithInfo, StringWithInfo]
 
 
+@lru_cache(maxsize=64)
+def _risk_request_parameters(csa_term: Optional[str], market_behaviour: Optional[str],
+                             use_historical_diddles_only: bool) -> RiskRequestParameters:
+    # Every calc in a context uses the same parameters, so build them once (callers get copies, as they're mutable)
+    return RiskRequestParameters(csa_term=csa_term, raw_results=True, market_behaviour=market_behaviour,
+                                 use_historical_diddles_only=use_historical_diddles_only)
+
+
 class PricingCache(metaclass=ABCMeta):
     """
     Weakref cache for instrument calcs
@@ -380,9 +390,9 @@ class PricingContext(ContextBaseWithDefault):
 
     @property
     def _parameters(self) -> RiskRequestParameters:
-        return RiskRequestParameters(csa_term=self.__csa_term, raw_results=True,
-                                     market_behaviour=self.__market_behaviour,
-                                     use_historical_diddles_only=self.__use_historical_diddles_only)
+        # A shallow copy (keeping any cached hash) is much cheaper than coercing the fields of new parameters
+        return copy.copy(_risk_request_parameters(self.__csa_term, self.__market_behaviour,
+                                                  self.__use_historical_diddles_only))
 
     @property
     def _scenario(self) -> Optional[MarketDataScenario]:
@@ -505,24 +515,33 @@ class PricingContext(ContextBaseWithDefault):
         return self.__class__(**clone_kwargs)
 
     def _calc(self, instrument: InstrumentBase, risk_key: RiskKey) -> PricingFuture:
-        pending = self.active_context.__pending
+        return self._calc_many(instrument, (risk_key,))[0]
 
+    def _calc_many(self, instrument: InstrumentBase, risk_keys: Iterable[RiskKey]) -> List[PricingFuture]:
         from gs_quant.instrument import DummyInstrument
         if isinstance(instrument, DummyInstrument):
-            return PricingFuture(StringWithInfo(value=instrument.dummy_result, risk_key=risk_key))
+            return [PricingFuture(StringWithInfo(value=instrument.dummy_result, risk_key=k)) for k in risk_keys]
+
+        # Look up the active context and its settings once for all the keys
+        pending = self.active_context.__pending
+        use_cache = self.use_cache
+        futures = []
 
-        future = pending.get((risk_key, instrument))
+        for risk_key in risk_keys:
+            future = pending.get((risk_key, instrument))
 
-        if future is None:
-            future = PricingFuture()
-            cached_result = PricingCache.get(risk_key, instrument) if self.use_cache else None
+            if future is None:
+                future = PricingFuture()
+                cached_result = PricingCache.get(risk_key, instrument) if use_cache else None
 
-            if cached_result is not None:
-                future.set_result(cached_result)
-            else:
-                pending[(risk_key, instrument)] = future
+                if cached_result is not None:
+                    future.set_result(cached_result)
+                else:
+                    pending[(risk_key, instrument)] = future
+
+            futures.append(future)
 
-        return future
+        return futures
 
     def calc(self, instrument: InstrumentBase, risk_measure: RiskMeasure) -> PricingFuture:
         """
@@ -14,15 +14,15 @@ specific language governing permissions and limitations
 under the License.
 """
 import datetime as dt
-from typing import Iterable, Optional, Tuple, Union, Type
+from typing import Dict, Iterable, Optional, Tuple, Union, Type
 
 from gs_quant.base import InstrumentBase, RiskKey
 from gs_quant.common import RiskMeasure
-from gs_quant.datetime.date import date_range, prev_business_date
+from gs_quant.datetime.date import date_range
 from gs_quant.risk import RollFwd, MarketDataScenario
 from gs_quant.risk.results import HistoricalPricingFuture, PricingFuture
 from .core import PricingContext
-from .markets import CloseMarket
+from .markets import CloseMarket, close_market_date
 from ..api.risk import GenericRiskApi
 
 
@@ -95,22 +95,23 @@ class HistoricalPricingContext(PricingContext):
             raise ValueError('Must supply start or dates')
 
     def _market(self, date: dt.date, location: str) -> CloseMarket:
-        date = prev_business_date(date) if date >= dt.date.today() else date
-        return CloseMarket(location=location, date=date, check=False)
+        return CloseMarket(location=location, date=close_market_date(location, date), check=False)
 
-    def calc(self, instrument: InstrumentBase, risk_measure: RiskMeasure) -> PricingFuture:
-        futures = []
+    def _markets(self, dates: Iterable[dt.date], location: str) -> Dict[dt.date, CloseMarket]:
+        # Built once per calc, via _market so that subclasses can still customise each date's market, with any rolling
+        # of dates memoised by close_market_date
+        return {d: self._market(d, location) for d in dates}
 
+    def calc(self, instrument: InstrumentBase, risk_measure: RiskMeasure) -> PricingFuture:
         provider = instrument.provider if self.provider is None else self.provider
         scenario = self._scenario
         parameters = self._parameters
-        location = self.market.location
-
-        for date in self.__date_range:
-            risk_key = RiskKey(provider, date, self._market(date, location), parameters, scenario, risk_measure)
-            futures.append(self._calc(instrument, risk_key))
+        markets = self._markets(self.__date_range, self.market.location)
 
-        return HistoricalPricingFuture(futures)
+        # Queue all the dates together, they're then sent in the same request(s) when the context exits
+        risk_keys = [RiskKey(provider, date, markets[date], parameters, scenario, risk_measure)
+                     for date in self.__date_range]
+        return HistoricalPricingFuture(self._calc_many(instrument, risk_keys))
 
     @property
     def date_range(self):
@@ -186,22 +187,20 @@ class BackToTheFuturePricingContext(HistoricalPricingContext):
             raise ValueError('Must supply start or dates')
 
     def calc(self, instrument: InstrumentBase, risk_measure: RiskMeasure) -> PricingFuture:
-        futures = []
+        risk_keys = []
 
         provider = instrument.provider if self.provider is None else self.provider
         base_scenario = self._scenario
         parameters = self._parameters
-        location = self.market.location
         base_market = self.market
+        pricing_date = self.pricing_date
+        markets = self._markets((d for d in self.__date_range if d <= pricing_date), base_market.location)
 
         for date in self.__date_range:
-            if date > self.pricing_date:
+            if date > pricing_date:
                 scenario = MarketDataScenario(RollFwd(date=date, realise_fwd=self._roll_to_fwds, name=self.name))
-                risk_key = RiskKey(provider, date, base_market, parameters, scenario, risk_measure)
-                futures.append(self._calc(instrument, risk_key))
+                risk_keys.append(RiskKey(provider, date, base_market, parameters, scenario, risk_measure))
             else:
-                risk_key = RiskKey(provider, date, self._market(date, location), parameters, base_scenario,
-                                   risk_measure)
-                futures.append(self._calc(instrument, risk_key))
+                risk_keys.append(RiskKey(provider, date, markets[date], parameters, base_scenario, risk_measure))
 
-        return HistoricalPricingFuture(futures)
+        return HistoricalPricingFuture(self._calc_many(instrument, risk_keys))
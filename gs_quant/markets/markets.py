@@ -15,6 +15,7 @@ under the License.
 """
 import datetime as dt
 import re
+from functools import lru_cache
 from typing import Mapping, Optional, Tuple, Union
 
 from gs_quant.base import Market, RiskKey
@@ -61,12 +62,18 @@ def close_market_date(_location: Optional[Union[PricingLocation, str]] = None,
     date = date or PricingContext.current.pricing_date
 
     if date >= dt.date.today():
-        # Don't use the calendars argument here as external users do not (yet) have access to that dataset
-        date = prev_business_date(date)
+        date = _prev_business_date(date)
 
     return date
 
 
+@lru_cache(maxsize=100_000)
+def _prev_business_date(date: dt.date) -> dt.date:
+    # Don't use the calendars argument here as external users do not (yet) have access to that dataset. As only
+    # weekends are used, the result never changes and can be cached
+    return prev_business_date(date)
+
+
 class MarketDataCoordinate(__MarketDataCoordinate):
 
     def __repr__(self):
@@ -244,7 +251,7 @@ class OverlayMarket(Market):
 
     @property
     def market_data_dict(self) -> MarketDataMap:
-        return {p.coordinate: p.value for p in self.market_data}
+        return dict(self.__market_data)
 
     @property
     def location(self) -> PricingLocation:
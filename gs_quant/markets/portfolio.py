@@ -17,16 +17,16 @@ import datetime as dt
 import logging
 import re
 from dataclasses import dataclass
+from collections import deque
 from itertools import chain
-from typing import Iterable, Optional, Tuple, Union
+from typing import FrozenSet, Iterable, Iterator, Optional, Tuple, Union
 from urllib.parse import quote
 
 import deprecation
-import numpy as np
 import pandas as pd
 from gs_quant.api.gs.assets import GsAssetApi
 from gs_quant.api.gs.portfolios import GsPortfolioApi
-from gs_quant.base import InstrumentBase
+from gs_quant.base import InstrumentBase, _get_slot_names
 from gs_quant.common import RiskMeasure
 from gs_quant.instrument import Instrument, AssetType
 from gs_quant.markets import HistoricalPricingContext, OverlayMarket, PricingContext, PositionContext
@@ -41,6 +41,21 @@ from more_itertools import unique_everseen
 _logger = logging.getLogger(__name__)
 
 
+def _unique_instruments(priceables: Iterable[PriceableImpl]) -> Iterator[Instrument]:
+    # Equal instruments are only listed once, but repeats of the same object are skipped by identity first, so that
+    # each object pays for the (field by field) instrument hash at most once
+    seen_ids = set()
+    seen = set()
+    for priceable in priceables:
+        if id(priceable) in seen_ids or not isinstance(priceable, Instrument):
+            continue
+
+        seen_ids.add(id(priceable))
+        if priceable not in seen:
+            seen.add(priceable)
+            yield priceable
+
+
 @dataclass
 class Portfolio(PriceableImpl):
     """A collection of instruments
@@ -49,6 +64,13 @@ class Portfolio(PriceableImpl):
 
     """
 
+    __slots__ = ('__priceables', '__priceables_by_name', '__all_paths', '__all_contents', '__id', '__quote_id', 'name',
+                 '__weakref__')
+
+    # Bumped whenever any portfolio's priceables change, so that cached traversals of nested portfolios (which can
+    # be modified independently of their parents) are discarded
+    __structure_version = 0
+
     def __init__(self,
                  priceables: Optional[Union[PriceableImpl, Iterable[PriceableImpl], dict]] = (),
                  name: Optional[str] = None):
@@ -118,12 +140,39 @@ class Portfolio(PriceableImpl):
 
     def __contains__(self, item):
         if isinstance(item, PriceableImpl):
-            return any(item in p.__priceables for p in self.all_portfolios + (self,))
+            # Priceables can be modified after being added, so only identity can be relied on in the cached set
+            return id(item) in self.__contents[1] or any(item in p.__priceables for p in (self,) + self.all_portfolios)
         elif isinstance(item, str):
-            return any(item in p.__priceables_by_name for p in self.all_portfolios + (self,))
+            return item in self.__contents[0]
         else:
             return False
 
+    @property
+    def __contents(self) -> Tuple[FrozenSet[str], FrozenSet[int]]:
+        """The names and ids of all priceables in this portfolio and any nested portfolios"""
+        version = Portfolio.__structure_version
+        if self.__all_contents is None or self.__all_contents[0] != version:
+            portfolios = (self,) + self.all_portfolios
+            self.__all_contents = (version,
+                                   frozenset(chain.from_iterable(p.__priceables_by_name for p in portfolios)),
+                                   frozenset(id(i) for p in portfolios for i in p.__priceables))
+
+        return self.__all_contents[1:]
+
+    def __copy__(self):
+        ret = super().__copy__()
+        ret.__all_paths = None
+        ret.__all_contents = None
+        return ret
+
+    def __getstate__(self):
+        # The cached traversals hold ids of objects in this process, which copies and unpickled portfolios don't
+        # contain, so they are rebuilt rather than copied
+        slots_state = {s: getattr(self, s) for s in _get_slot_names(type(self)) if hasattr(self, s)}
+        slots_state['_Portfolio__all_paths'] = None
+        slots_state['_Portfolio__all_contents'] = None
+        return getattr(self, '__dict__', None) or None, slots_state
+
     def __len__(self):
         return len(self.__priceables)
 
@@ -131,25 +180,30 @@ class Portfolio(PriceableImpl):
         return iter(self.__priceables)
 
     def __hash__(self):
-        hash_code = hash(self.name) ^ hash(self.__id)
-        for priceable in self.__priceables:
-            hash_code ^= hash(priceable)
-
-        return hash_code
+        # Hash the priceables as a tuple, so that order matters and duplicates don't cancel each other out
+        return hash((self.name, self.__id, self.__priceables))
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Portfolio):
             return False
 
-        for path in self.all_paths:
-            try:
-                if path(self) != path(other):
-                    return False
-            except (IndexError, TypeError):
-                # indexerror occurs when two portfolios are of different lengths
-                # typeerror: instrument is not subscriptable occurs when two portfolios are of different depths
+        # Walk both portfolios together, comparing nested portfolios level by level
+        stack = [(self, other)]
+        while stack:
+            portfolio, other_portfolio = stack.pop()
+            if len(portfolio.__priceables) != len(other_portfolio.__priceables):
                 return False
 
+            for priceable, other_priceable in zip(portfolio.__priceables, other_portfolio.__priceables):
+                if isinstance(priceable, Portfolio):
+                    if not isinstance(other_priceable, Portfolio):
+                        return False
+                    stack.append((priceable, other_priceable))
+                elif priceable != other_priceable:
+                    return False
+
         return True
 
     def __add__(self, other):
@@ -178,6 +232,9 @@ class Portfolio(PriceableImpl):
     def priceables(self, priceables: Union[PriceableImpl, Iterable[PriceableImpl]]):
         self.__priceables = (priceables,) if isinstance(priceables, PriceableImpl) else tuple(priceables)
         self.__priceables_by_name = {}
+        self.__all_paths = None
+        self.__all_contents = None
+        Portfolio.__structure_version += 1
 
         for idx, i in enumerate(self.__priceables):
             if i and i.name:
@@ -187,15 +244,25 @@ class Portfolio(PriceableImpl):
     def priceables(self):
         self.__priceables = None
         self.__priceables_by_name = None
+        self.__all_paths = None
+        self.__all_contents = None
+        Portfolio.__structure_version += 1
 
     @property
     def instruments(self) -> Tuple[Instrument, ...]:
-        return tuple(unique_everseen(i for i in self.__priceables if isinstance(i, Instrument)))
+        return tuple(_unique_instruments(self.__priceables))
 
     @property
     def all_instruments(self) -> Tuple[Instrument, ...]:
-        instr = chain(self.instruments, chain.from_iterable(p.all_instruments for p in self.all_portfolios))
-        return tuple(unique_everseen(instr))
+        return tuple(self.iter_all_instruments())
+
+    def iter_all_instruments(self) -> Iterator[Instrument]:
+        """
+        Lazily iterate over the unique instruments in this portfolio and any nested portfolios, in the same order as
+        all_instruments. Instruments should not be modified while iterating
+        """
+        priceables = chain(self.__priceables, chain.from_iterable(p.__priceables for p in self.all_portfolios))
+        return _unique_instruments(priceables)
 
     @property
     def portfolios(self) -> Tuple[PriceableImpl, ...]:
@@ -203,17 +270,19 @@ class Portfolio(PriceableImpl):
 
     @property
     def all_portfolios(self) -> Tuple[PriceableImpl, ...]:
-        stack = list(self.portfolios)
-        portfolios = list(unique_everseen(stack))
-
-        while stack:
-            portfolio = stack.pop()
-            if portfolio in portfolios:
+        portfolios = []
+        queue = deque(self.portfolios)
+        seen = {id(self)}
+
+        # Walk each level of nesting once, expanding portfolios reachable via several parents (or cycles) only once
+        while queue:
+            portfolio = queue.popleft()
+            if id(portfolio) in seen:
                 continue
 
-            sub_portfolios = portfolio.portfolios
-            portfolios.extend(sub_portfolios)
-            stack.extend(sub_portfolios)
+            seen.add(id(portfolio))
+            portfolios.append(portfolio)
+            queue.extend(portfolio.portfolios)
 
         return tuple(unique_everseen(portfolios))
 
@@ -359,21 +428,61 @@ class Portfolio(PriceableImpl):
 
     @classmethod
     def from_frame(cls, data: pd.DataFrame, mappings: dict = None):
-        def get_value(this_row: pd.Series, attribute: str):
+        def get_value(this_row: tuple, this_series: Optional[pd.Series], attribute: str):
             value = mappings.get(attribute, attribute)
-            return value(this_row) if callable(value) else this_row.get(value)
+            if callable(value):
+                return value(this_series)
+
+            idx = column_indices.get(value)
+            return None if idx is None else this_row[idx]
+
+        def get_sources(instrument: Instrument) -> Tuple[dict, tuple, tuple]:
+            # Where each property's value comes from, as per get_value, resolved once per instrument type rather than
+            # per row and property: None (no such column), a column index or a callable mapping
+            missing = {}
+            by_column = []
+            by_callable = []
+            for attribute in instrument.properties():
+                value = mappings.get(attribute, attribute)
+                if callable(value):
+                    by_callable.append((attribute, value))
+                elif value in column_indices:
+                    by_column.append((attribute, column_indices[value]))
+                else:
+                    missing[attribute] = None
+
+            return missing, tuple(by_column), tuple(by_callable)
 
         instruments = []
         mappings = mappings or {}
-        data = data.replace({np.nan: None})
+        column_indices = {c: i for i, c in enumerate(data.columns)}
+        # Callable mappings are given the row as a series, so only build one when it's needed
+        series_needed = any(callable(v) for v in mappings.values())
+        # The instrument class and its properties for each distinct asset_class/type (or $type), rather than building
+        # an instrument just to find its class on every row
+        instrument_types = {}
+
+        for row in data.itertuples(index=False, name=None):
+            # Treat NaNs as missing values
+            row = tuple(None if isinstance(v, float) and v != v else v for v in row)
+            if not any(v for v in row if v is not None):
+                continue
 
-        for row in (r for _, r in data.iterrows() if any(v for v in r.values if v is not None)):
+            series = pd.Series(row, index=data.columns, dtype=object) if series_needed else None
             instrument = None
             for init_keys in (('asset_class', 'type'), ('$type',)):
-                init_values = tuple(filter(None, (get_value(row, k) for k in init_keys)))
+                init_values = tuple(filter(None, (get_value(row, series, k) for k in init_keys)))
                 if len(init_keys) == len(init_values):
-                    instrument = Instrument.from_dict(dict(zip(init_keys, init_values)))
-                    instrument = instrument.from_dict({p: get_value(row, p) for p in instrument.properties()})
+                    instrument_type = instrument_types.get(init_values)
+                    if instrument_type is None:
+                        instrument = Instrument.from_dict(dict(zip(init_keys, init_values)))
+                        instrument_type = instrument_types[init_values] = (instrument,) + get_sources(instrument)
+
+                    instrument, missing, by_column, by_callable = instrument_type
+                    values = dict(missing)
+                    values.update((p, row[idx]) for p, idx in by_column)
+                    values.update((p, fn(series)) for p, fn in by_callable)
+                    instrument = instrument.from_dict(values)
                     break
 
             if instrument:
@@ -389,7 +498,7 @@ class Portfolio(PriceableImpl):
             csv_file: str,
             mappings: Optional[dict] = None
     ):
-        data = pd.read_csv(csv_file, skip_blank_lines=True).replace({np.nan: None})
+        data = pd.read_csv(csv_file, skip_blank_lines=True)
         reg = re.compile(r'\.[0-9]')
         dupelist = [re.sub(reg, '', word) for word in data.columns if reg.search(word)]
         if len(dupelist):
@@ -409,30 +518,56 @@ class Portfolio(PriceableImpl):
 
     def pop(self, item) -> PriceableImpl:
         priceable = self[item]
-        self.priceables = [inst for inst in self.instruments if inst != priceable]
+
+        # Remove just the matching positions from this portfolio, keeping the order and any sub-portfolios
+        if isinstance(item, (int, slice)):
+            indices = range(len(self.__priceables))[item]
+            indices = {indices} if isinstance(indices, int) else set(indices)
+        elif isinstance(item, PortfolioPath):
+            *parent_path, idx = item
+            if parent_path:
+                PortfolioPath(tuple(parent_path))(self).pop(idx)
+                return priceable
+
+            indices = {idx}
+        else:
+            keys = item if isinstance(item, list) else (item,)
+            indices = {next(iter(path)) for key in keys for path in self.paths(key) if len(path) == 1}
+
+        if indices:
+            self.priceables = tuple(p for idx, p in enumerate(self.__priceables) if idx not in indices)
+
         return priceable
 
     def extend(self, portfolio: Iterable):
         self.priceables += tuple([p for p in portfolio])
 
     def to_frame(self, mappings: Optional[dict] = None) -> pd.DataFrame:
-        def to_records(portfolio: Portfolio) -> list:
-            records = []
+        """
+        Returns a dataframe of the instruments in this portfolio, indexed by portfolio name and instrument
 
+        :param mappings: dictionary of column name to either the name of an existing column or a callable. Callables
+            are applied to each row, unless they have a truthy __vectorized__ attribute, in which case they are called
+            once with the whole dataframe and must return a column (e.g. a series aligned to its index)
+        """
+        def add_records(portfolio: Portfolio):
             for priceable in portfolio.priceables:
                 if isinstance(priceable, Portfolio):
-                    records.extend(to_records(priceable))
+                    add_records(priceable)
                 else:
-                    as_dict = priceable.as_dict()
+                    # as_dict() returns a new dict, so add to it rather than copying it
+                    record = priceable.as_dict()
                     if not hasattr(priceable, 'asset_class'):
-                        as_dict['$type'] = priceable.type_
-
-                    records.append(dict(chain(as_dict.items(),
-                                              (('instrument', priceable), ('portfolio', portfolio.name)))))
+                        record['$type'] = priceable.type_
 
-            return records
+                    record['instrument'] = priceable
+                    record['portfolio'] = portfolio.name
+                    records.append(record)
 
-        df = pd.DataFrame.from_records(to_records(self)).set_index(['portfolio', 'instrument'])
+        # from_records is quicker than building a dict of column lists here, as it converts the rows in C
+        records = []
+        add_records(self)
+        df = pd.DataFrame.from_records(records).set_index(['portfolio', 'instrument'])
         all_columns = df.columns.to_list()
         columns = sorted(c for c in all_columns if c not in ('asset_class', 'type', '$type'))
 
@@ -446,6 +581,8 @@ class Portfolio(PriceableImpl):
         for key, value in mappings.items():
             if isinstance(value, str):
                 df[key] = df[value]
+            elif getattr(value, '__vectorized__', False):
+                df[key] = value(df)
             elif callable(value):
                 df[key] = len(df) * [None]
                 df[key] = df.apply(value, axis=1)
@@ -454,46 +591,61 @@ class Portfolio(PriceableImpl):
 
     def to_csv(self, csv_file: str, mappings: Optional[dict] = None, ignored_cols: Optional[list] = None):
         port_df = self.to_frame(mappings or {})
-        port_df = port_df[np.setdiff1d(port_df.columns, ignored_cols or [])]
-        port_df.reset_index(drop=True, inplace=True)
+        ignored_cols = set(ignored_cols or ())
 
-        port_df.to_csv(csv_file)
+        # The frame is ours, so replace the index and select (sorted) columns on write, rather than copying it twice
+        port_df.index = pd.RangeIndex(len(port_df))
+        port_df.to_csv(csv_file, columns=sorted(c for c in port_df.columns if c not in ignored_cols))
 
     @property
     def all_paths(self) -> Tuple[PortfolioPath, ...]:
-        paths = ()
-        stack = [(None, self)]
-        while stack:
-            parent, portfolio = stack.pop()
+        version = Portfolio.__structure_version
+        if self.__all_paths is not None and self.__all_paths[0] == version:
+            return self.__all_paths[1]
+
+        paths = []
+        queue = deque(((None, self),))
+        while queue:
+            parent, portfolio = queue.pop()
 
             for idx, priceable in enumerate(portfolio.__priceables):
                 path = parent + PortfolioPath(idx) if parent is not None else PortfolioPath(idx)
                 if isinstance(priceable, Portfolio):
-                    stack.insert(0, (path, priceable))
+                    queue.appendleft((path, priceable))
                 else:
-                    paths += (path,)
+                    paths.append(path)
 
+        paths = tuple(paths)
+        self.__all_paths = (version, paths)
         return paths
 
     def paths(self, key: Union[str, PriceableImpl]) -> Tuple[PortfolioPath, ...]:
         if not isinstance(key, (str, Instrument, Portfolio)):
             raise ValueError('key must be a name or Instrument or Portfolio')
 
-        if isinstance(key, str):
-            idx = self.__priceables_by_name.get(key)
-        else:
-            idx = []
-            for p_idx, p in enumerate(self.__priceables):
-                if p == key or getattr(p, "unresolved", None) == key:
-                    idx.append(p_idx)
+        is_name = isinstance(key, str)
+        paths = []
+        # Walk depth-first, with the matches in each portfolio ahead of those in its sub-portfolios, carrying the
+        # path so far as a plain tuple
+        stack = [((), self)]
 
-        paths = tuple(PortfolioPath(i) for i in idx) if idx else ()
+        while stack:
+            prefix, portfolio = stack.pop()
+            idx = portfolio.__priceables_by_name.get(key) if is_name else None
+            if idx:
+                paths.extend(PortfolioPath(prefix + (i,)) for i in idx)
 
-        for path, porfolio in ((PortfolioPath(i), p)
-                               for i, p in enumerate(self.__priceables) if isinstance(p, Portfolio)):
-            paths += tuple(path + sub_path for sub_path in porfolio.paths(key))
+            sub_portfolios = []
+            for p_idx, p in enumerate(portfolio.__priceables):
+                # Check identity first, as comparing instruments by value compares every field
+                if not is_name and (p is key or p == key or getattr(p, "unresolved", None) == key):
+                    paths.append(PortfolioPath(prefix + (p_idx,)))
+                if isinstance(p, Portfolio):
+                    sub_portfolios.append((prefix + (p_idx,), p))
 
-        return paths
+            stack.extend(reversed(sub_portfolios))
+
+        return tuple(paths)
 
     def resolve(self, in_place: bool = True) -> Optional[Union[PricingFuture, PriceableImpl, dict]]:
         priceables = self._get_instruments(self.__position_context.position_date, in_place, True)
@@ -596,7 +748,7 @@ class Portfolio(PriceableImpl):
             positions = response.positions if response else []
             instruments = GsAssetApi.get_instruments_for_positions(positions)
             if in_place:
-                self.__priceables = instruments
+                self.priceables = instruments
             return instruments
         return self.__priceables if return_priceables else self.all_instruments
 
@@ -29,6 +29,7 @@ _logger = logging.getLogger(__name__)
 
 
 class PriceableImpl(Priceable, ABC):
+    __slots__ = ()
 
     @property
     def _pricing_context(self) -> PricingContext:
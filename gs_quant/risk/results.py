@@ -681,15 +681,15 @@ class PortfolioRiskResult(CompositeResultFuture):
 
         def first_value(portfolio_result):
             if len(portfolio_result.__risk_measures) > 1:
-                return next(iter(portfolio_result[next(iter(portfolio_result.portfolio.all_instruments))].values()))
+                return next(iter(portfolio_result[next(portfolio_result.portfolio.iter_all_instruments())].values()))
             else:
-                return portfolio_result[next(iter(portfolio_result.__portfolio.all_instruments))]
+                return portfolio_result[next(portfolio_result.__portfolio.iter_all_instruments())]
 
         if isinstance(other, (int, float)):
             return PortfolioRiskResult(self.__portfolio, self.__risk_measures, [f + other for f in self.futures])
         elif isinstance(other, PortfolioRiskResult):
             if not _risk_keys_compatible(first_value(self), first_value(other)) and not \
-                    set(self.__portfolio.all_instruments).isdisjoint(other.__portfolio.all_instruments):
+                    set(self.__portfolio.iter_all_instruments()).isdisjoint(other.__portfolio.iter_all_instruments()):
                 raise ValueError('Results must have matching scenario and location')
 
             self_dt = (first_value(self).risk_key.date,) if len(self.dates) == 0 else self.dates
@@ -697,7 +697,7 @@ class PortfolioRiskResult(CompositeResultFuture):
             dates_overlap = not set(self_dt).isdisjoint(other_dt)
 
             if not set(self.__risk_measures).isdisjoint(other.__risk_measures) and dates_overlap and not \
-                    set(self.__portfolio.all_instruments).isdisjoint(other.__portfolio.all_instruments):
+                    set(self.__portfolio.iter_all_instruments()).isdisjoint(other.__portfolio.iter_all_instruments()):
                 raise ValueError('Results overlap on risk measures, instruments or dates')
 
             self_futures = as_multiple_result_futures(self).futures
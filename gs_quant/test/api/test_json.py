@@ -19,7 +19,8 @@ import json
 
 import pytz
 
-from gs_quant.json_convertors import decode_iso_date_or_datetime
+from gs_quant.json_convertors import decode_date_or_str, decode_iso_date_or_datetime, decode_optional_date, \
+    encode_date_or_str
 from gs_quant.json_encoder import JSONEncoder
 from gs_quant.workflow import BinaryImageComments, ImgType, Encoding, HyperLinkImageComments, \
     VisualStructuringReport, ChartingParameters, OverlayType
@@ -60,6 +61,21 @@ def test_date_or_datetime():
     assert (dt1, d2) == decode_iso_date_or_datetime([dt1.isoformat(), d2.isoformat()])
 
 
+def test_date_strings():
+    assert decode_optional_date('2020-07-28') == dt.date(2020, 7, 28)
+    assert decode_optional_date('2020-7-8') == dt.date(2020, 7, 8)
+    assert decode_date_or_str('2020-07-28') == dt.date(2020, 7, 28)
+    assert decode_date_or_str('28Jul20') == dt.date(2020, 7, 28)
+    assert decode_date_or_str('2020-W31-2') == '2020-W31-2'
+    assert decode_date_or_str('2024-06') == '2024-06'
+    assert decode_date_or_str('3m') == '3m'
+
+    assert encode_date_or_str(dt.date(2020, 7, 28)) == '2020-07-28'
+    assert encode_date_or_str(dt.date(2020, 7, 28)) is encode_date_or_str(dt.date(2020, 7, 28))
+    assert encode_date_or_str(dt.datetime(2020, 7, 28, 10)) == '2020-07-28T10:00:00'
+    assert encode_date_or_str('3m') == '3m'
+
+
 def test_time():
     t = dt.time(10, 14, 59, 59876)
     json_time = json.dumps(t, cls=JSONEncoder)
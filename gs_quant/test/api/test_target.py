@@ -55,3 +55,90 @@ def test_classes():
                 _ = object.__getattribute__(obj, fld.name)
                 if fld.init:
                     setattr(obj, fld.name, None)
+
+
+def test_from_dict():
+    from dataclasses_json.core import _decode_dataclass
+    from gs_quant.target.countries import Country
+
+    as_dict = {'name': 'United States', 'id': 'US1', 'xref': {'alpha2': 'US', 'countryCode': 840},
+               'subRegion': 'Northern America', 'region_code': '019', 'createdTime': '2020-01-01T00:00:00.000Z',
+               'entitlements': {'view': ['guid:1'], 'edit': None}, 'unknown': 'ignored'}
+    country = Country.from_dict(as_dict)
+    assert country == _decode_dataclass(Country, as_dict, False)
+    assert (country.id, country.sub_region, country.region_code) == ('US1', 'Northern America', '019')
+    assert country.xref.country_code == '840'
+    assert country.created_time.year == 2020
+    assert country.entitlements.view == ('guid:1',)
+    assert Country.from_dict(country.to_dict()) == country
+    assert Country.from_dict(country) is country
+
+
+def test_from_dict_instrument():
+    from gs_quant.common import Currency, PayReceive
+    from gs_quant.target.instrument import CSLPython, IRSwap
+    from gs_quant.target.common import CSLDouble
+
+    swap = IRSwap('Pay', '10y', 'USD', fixed_rate=0.01, notional_amount=1e6, effective_date='1y')
+    from_dict = IRSwap.from_dict({'payOrReceive': 'Pay', 'terminationDate': '10y', 'notionalCurrency': 'USD',
+                                  'notionalAmount': 1e6, 'effectiveDate': '1y', 'fixedRate': 0.01})
+    assert from_dict == swap
+    assert from_dict.__dict__ == swap.__dict__
+    assert from_dict.pay_or_receive is PayReceive.Pay and from_dict.notional_currency is Currency.USD
+    assert IRSwap.from_dict(swap.to_dict()) == swap
+
+    csl = CSLPython.from_dict({'className': 'X', 'doubleParams': [{'name': 'a', 'doubleValue': 1}]})
+    assert csl.double_params == (CSLDouble(name='a', double_value=1.0),)
+    assert csl.denominated is None
+    # Each instance has its own dict
+    csl.denominated = 'USD'
+    assert CSLPython.from_dict({}).denominated is None
+
+
+def test_from_dict_interns_strings():
+    from gs_quant.target.instrument import CommodOTCOptionLeg
+
+    legs = [CommodOTCOptionLeg.from_dict({'contract': ''.join(['F', '2', '4']), 'commodity': 'WTI'}) for _ in range(2)]
+    assert legs[0].contract == 'F24'
+    assert legs[0].contract is legs[1].contract
+
+
+def test_to_dict_interns_keys():
+    from gs_quant.target.instrument import CommodOTCOptionLeg, EqOption
+
+    keys = [next(k for k in i.to_dict() if k == 'assetClass') for i in (CommodOTCOptionLeg(), EqOption())]
+    assert keys[0] is keys[1]
+
+
+def test_from_dict_float_or_str():
+    from gs_quant.target.instrument import EqOption
+
+    options = [EqOption.from_dict({'underlier': '.SPX', 'strikePrice': ''.join(['AT', 'MF']), 'premium': '1.5'})
+               for _ in range(2)]
+    assert options[0].strike_price == 'ATMF' and options[0].premium == 1.5
+    assert options[0].strike_price is options[1].strike_price
+    assert EqOption.from_dict({'strikePrice': 100}).strike_price == 100.0
+
+
+def test_from_dict_enums():
+    import pytest
+    from gs_quant.common import CurrencyName, OptionType
+    from gs_quant.target.instrument import CommodOTCOptionLeg
+
+    leg = CommodOTCOptionLeg.from_dict({'optionType': 'call', 'fixingCurrency': 'United States Dollar'})
+    assert leg.option_type is OptionType.Call
+    assert leg.fixing_currency is CurrencyName.United_States_Dollar
+    assert CommodOTCOptionLeg.from_dict({'optionType': OptionType.Put}).option_type is OptionType.Put
+
+    with pytest.raises(ValueError):
+        CommodOTCOptionLeg.from_dict({'optionType': 'Straddle'})
+
+
+def test_from_dict_nulls():
+    from gs_quant.target.instrument import EqOption
+
+    option = EqOption.from_dict({'underlier': '.SPX', 'strikePrice': None, 'optionType': None, 'premium': None})
+    assert option == EqOption('.SPX', premium=None)
+    assert (option.strike_price, option.premium) == (None, None)
+    assert 'strike_price' not in option.__dict__
+    assert EqOption.from_dict({'strike_price': 'ATM', 'strikePrice': None}).strike_price is None
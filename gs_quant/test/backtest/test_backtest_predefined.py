@@ -18,10 +18,10 @@ import gs_quant.backtests.predefined_asset_engine
 import datetime as dt
 from gs_quant.backtests.actions import AddTradeAction
 from gs_quant.backtests.strategy import Strategy
-from gs_quant.backtests.triggers import OrdersGeneratorTrigger, DateTriggerRequirements, DateTrigger
+from gs_quant.backtests.triggers import OrdersGeneratorTrigger, DateTriggerRequirements, DateTrigger, TriggerInfo
 from gs_quant.backtests.backtest_objects import PredefinedAssetBacktest
 from gs_quant.backtests.predefined_asset_engine import PredefinedAssetEngine
-from gs_quant.backtests.data_sources import DataManager
+from gs_quant.backtests.data_sources import DataManager, GsDataSource, GenericDataSource, MissingDataStrategy
 import pandas as pd
 import numpy as np
 from gs_quant.data.core import DataFrequency
@@ -121,6 +121,37 @@ def test_backtest_predefined_timezone_aware():
     assert len(backtest.trade_ledger()) == 364
 
 
+class NeverTriggerRequirements(DateTriggerRequirements):
+    def has_triggered(self, state, backtest=None) -> TriggerInfo:
+        return TriggerInfo(False)
+
+
+def test_backtest_predefined_overridden_requirements():
+    tz = 'Europe/London'
+    states = pd.bdate_range('2021-01-04T08:00', '2021-01-08T17:00', freq='1H', tz=tz).to_series() \
+        .between_time('08:00', '17:00').index.tolist()
+    trigger_dates = [s for s in states if s.hour == 17]
+    data = np.random.randn(len(states))
+    s_eod = pd.Series(index=states, data=data).at_time('17:00')
+    s_eod.index = s_eod.index.date
+
+    generic_bond_future = IRBondFuture(currency='EUR', name='EURBond')
+    data_manager = DataManager()
+    data_manager.add_data_source(pd.Series(index=states, data=data), DataFrequency.REAL_TIME, generic_bond_future,
+                                 ValuationFixingType.PRICE)
+    data_manager.add_data_source(s_eod, DataFrequency.DAILY, generic_bond_future, ValuationFixingType.PRICE)
+
+    engine = PredefinedAssetEngine(data_mgr=data_manager, tz=timezone(tz))
+    for requirements_type, trade_count in ((DateTriggerRequirements, len(trigger_dates)),
+                                           (NeverTriggerRequirements, 0)):
+        # An overridden has_triggered is used rather than the batch implementation of the class it overrides
+        trigger = DateTrigger(trigger_requirements=requirements_type(dates=trigger_dates),
+                              actions=[AddTradeAction(generic_bond_future)])
+        backtest = engine.run_backtest(strategy=Strategy(None, triggers=trigger), start=states[0], end=states[-1],
+                                       states=states)
+        assert len(backtest.trade_ledger()) == trade_count
+
+
 def test_backtest_predefined():
     # Test simple MOC order
     trigger = ExampleTestTrigger()
@@ -195,3 +226,102 @@ def test_backtest_predefined():
     assert underlying not in holdings[end]
     assert weights[end][cash_asset] == 1
     assert underlying not in weights[end]
+
+
+def test_backtests_parallel():
+    start = dt.date(2021, 1, 4)
+    mid = dt.date(2021, 1, 5)
+    end = dt.date(2021, 1, 6)
+
+    data_mgr = DataManager()
+    underlying = IRBondFuture(currency='EUR', name='TestRic')
+    close_prices = pd.Series(dtype=float)
+    close_prices[start] = 1
+    close_prices[mid] = 1.5
+    close_prices[end] = 2
+    data_mgr.add_data_source(close_prices, DataFrequency.DAILY, underlying, ValuationFixingType.PRICE)
+
+    strategies = [Strategy(initial_portfolio=None, triggers=[ExampleTestTrigger()]),
+                  Strategy(initial_portfolio=None, triggers=[])]
+    engine = PredefinedAssetEngine(data_mgr=data_mgr)
+    # these mocks are needed as the date functions need a GSSession
+    with mock.patch('gs_quant.backtests.predefined_asset_engine.is_business_day', return_value=True), \
+            mock.patch('gs_quant.backtests.predefined_asset_engine.business_day_offset', return_value=mid):
+        backtests = engine.run_backtests_parallel(strategies, start=start, end=end, n_workers=2)
+
+    assert len(backtests) == 2
+    assert backtests[0].performance[end] == 100.5
+    assert len(backtests[0].orders) == 1
+    assert backtests[1].performance[end] == 100
+    assert len(backtests[1].orders) == 0
+
+
+class DuckTypedTrigger:
+    """A trigger which is not a Trigger subclass, so has no batch implementation"""
+
+    def __init__(self):
+        self.trigger = ExampleTestTrigger()
+
+    def __getattr__(self, item):
+        if item == 'has_triggered_batch':
+            raise AttributeError(item)
+        return getattr(self.trigger, item)
+
+
+def test_backtest_predefined_duck_typed_trigger():
+    start = dt.date(2021, 1, 4)
+    mid = dt.date(2021, 1, 5)
+    end = dt.date(2021, 1, 6)
+
+    data_mgr = DataManager()
+    underlying = IRBondFuture(currency='EUR', name='TestRic')
+    close_prices = pd.Series({start: 1, mid: 1.5, end: 2}, dtype=float)
+    data_mgr.add_data_source(close_prices, DataFrequency.DAILY, underlying, ValuationFixingType.PRICE)
+
+    with mock.patch('gs_quant.backtests.predefined_asset_engine.is_business_day', return_value=True), \
+            mock.patch('gs_quant.backtests.predefined_asset_engine.business_day_offset', return_value=mid):
+        strategy = Strategy(initial_portfolio=None, triggers=[DuckTypedTrigger()])
+        backtest = PredefinedAssetEngine(data_mgr=data_mgr).run_backtest(strategy, start=start, end=end)
+
+    # Evaluated date by date, as for triggers without a batch result
+    assert backtest.performance[end] == 100.5
+    assert len(backtest.orders) == 1
+
+
+def test_data_prefetch(mocker):
+    start = dt.date(2021, 1, 4)
+    end = dt.date(2021, 1, 6)
+    data = pd.DataFrame({'rate': [1.0, 2.0]}, index=pd.to_datetime([start, end]))
+    get_data = mocker.patch('gs_quant.backtests.data_sources.Dataset.get_data', return_value=data)
+
+    data_mgr = DataManager()
+    data_mgr.add_data_source(GsDataSource('DATASET_ABC', 'ASSET123', start, end), DataFrequency.DAILY,
+                             IRBondFuture(currency='EUR', name='TestRic'), ValuationFixingType.PRICE)
+    data_mgr.add_data_source(pd.Series({start: 1.0}), DataFrequency.REAL_TIME,
+                             IRBondFuture(currency='EUR', name='TestRic'), ValuationFixingType.PRICE)
+    data_mgr.prefetch()
+    assert get_data.call_count == 1
+
+    instrument = IRBondFuture(currency='EUR', name='TestRic')
+    assert data_mgr.get_data(end, instrument, ValuationFixingType.PRICE) == 2.0
+    assert get_data.call_count == 1
+
+
+def test_generic_data_source_lookup():
+    start = dt.date(2021, 1, 4)
+    mid = dt.date(2021, 1, 5)
+    end = dt.date(2021, 1, 6)
+
+    source = GenericDataSource(pd.Series({start: 1.0, end: 3.0}))
+    assert source.get_data(start) == 1.0
+    assert source.get_data([start, end]) == [1.0, 3.0]
+
+    source = GenericDataSource(pd.Series([1.0, 3.0], index=pd.to_datetime([start, end])),
+                               MissingDataStrategy.interpolate)
+    assert source.get_data(start) == 1.0
+    assert source.get_data(mid) == 2.0
+    assert source.get_data(end) == 3.0
+
+    times = pd.to_datetime([dt.datetime(2021, 1, 4, 10), dt.datetime(2021, 1, 4, 12)])
+    source = GenericDataSource(pd.Series([1.0, 2.0], index=times))
+    assert source.get_data(dt.datetime(2021, 1, 4, 12)) == 2.0
@@ -46,6 +46,23 @@ def test_date_trigger():
     assert trigger.has_triggered(dt.date(2021, 11, 10))
 
 
+def test_date_trigger_batch():
+    action = AddTradeAction(IRSwap())
+    states = [dt.datetime(2021, 11, 9, 10, 0), dt.datetime(2021, 11, 10, 14, 0), dt.date(2021, 11, 11)]
+
+    trigger = DateTrigger(DateTriggerRequirements([dt.datetime(2021, 11, 9, 14, 0),
+                                                   dt.datetime(2021, 11, 10, 14, 0)]), [action])
+    assert list(trigger.has_triggered_batch(states)) == [bool(trigger.has_triggered(s)) for s in states]
+    assert list(trigger.has_triggered_batch(states)) == [False, True, False]
+
+    trigger = DateTrigger(DateTriggerRequirements([dt.datetime(2021, 11, 9, 14, 0),
+                                                   dt.datetime(2021, 11, 11, 14, 0)], entire_day=True), [action])
+    assert list(trigger.has_triggered_batch(states)) == [True, False, True]
+
+    agg_trigger = AggregateTrigger(AggregateTriggerRequirements([trigger], aggregate_type=AggType.ALL_OF))
+    assert agg_trigger.has_triggered_batch(states) is None
+
+
 def test_aggregate_triggger():
     # Test Aggregate Trigger
     action_1 = AddTradeAction(IRSwap())
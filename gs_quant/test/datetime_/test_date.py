@@ -63,3 +63,12 @@ def test_day_count_fraction():
     # Feb 29 is within range, so should use 366
     assert day_count_fraction(start, end, DayCountConvention.ACTUAL_365L, PaymentFrequency.ANNUALLY) == \
         approx(2.087431693989)
+
+
+def test_date_range():
+    dates = tuple(date_range(dt.date(2021, 1, 1), dt.date(2021, 1, 12), week_mask='1111100'))
+    assert dates == (dt.date(2021, 1, 1), dt.date(2021, 1, 4), dt.date(2021, 1, 5), dt.date(2021, 1, 6),
+                     dt.date(2021, 1, 7), dt.date(2021, 1, 8), dt.date(2021, 1, 11), dt.date(2021, 1, 12))
+    assert all(type(d) is dt.date for d in dates)
+    assert tuple(date_range(dt.date(2021, 1, 4), 3)) == (dt.date(2021, 1, 4), dt.date(2021, 1, 5),
+                                                         dt.date(2021, 1, 6))
@@ -14,7 +14,17 @@ specific language governing permissions and limitations
 under the License.
 """
 
-from gs_quant.instrument import EqOption, FXMultiCrossBinary, FXMultiCrossBinaryLeg, Instrument
+import datetime as dt
+import inspect
+import pickle
+import weakref
+
+from dataclasses_json.core import _asdict
+
+from gs_quant.common import AssetClass, AssetType, OptionType
+from gs_quant.instrument import CommodOTCSwap, CSLPython, EqOption, FXMultiCrossBinary, FXMultiCrossBinaryLeg, \
+    Instrument
+from gs_quant.target.common import CSLDouble
 from gs_quant.test.utils.mock_calc import MockCalc
 
 
@@ -37,3 +47,74 @@ def test_nested_leg_from_dict():
     mcb_dict = mcb.to_dict()
     new_mcb = Instrument.from_dict(mcb_dict)
     assert new_mcb == mcb
+
+
+def test_unresolved_defaults():
+    eq_option = EqOption('.FTSE', strike_price='ATMS')
+    assert (eq_option.resolution_key, eq_option.unresolved, eq_option.metadata) == (None, None, None)
+    assert '_InstrumentBase__resolution_key' not in eq_option.__dict__
+
+    eq_option.metadata = {'id': 1}
+    assert eq_option.__dict__['metadata'] == {'id': 1}
+    clone = eq_option.clone(strike_price='ATMF')
+    assert clone.metadata == {'id': 1}
+    assert (clone.resolution_key, clone.unresolved) == (None, None)
+    assert EqOption('.FTSE').metadata is None
+
+
+def test_clone_instance_dict():
+    swap = CommodOTCSwap(number_of_periods=2)
+    clone = swap.clone(number_of_periods=3)
+    assert not [k for k in clone.__dict__ if k.startswith('_InstrumentBase__') or k == 'metadata']
+    assert weakref.ref(clone)() is clone
+
+
+def test_type_alias():
+    # type is read via an alias for the type_ field, set up with the class
+    assert isinstance(inspect.getattr_static(CommodOTCSwap, 'type'), property)
+    swap = CommodOTCSwap(number_of_periods=2)
+    assert (swap.type, swap.asset_class) == (AssetType.SwapStrategy, AssetClass.Commod)
+
+    # Subclasses can still define their own attribute of that name
+    class TypedSwap(CommodOTCSwap):
+        type = 'subclass type'
+
+    assert TypedSwap(number_of_periods=2).type == 'subclass type'
+
+
+def test_to_dict():
+    eq_option = EqOption('.FTSE', expiration_date=dt.date(2024, 6, 21), strike_price='ATMS', option_type='Call',
+                         name='option')
+    csl = CSLPython(class_name='X', denominated='USD', double_params=(CSLDouble(name='a', double_value=1.0),))
+    for instrument in (eq_option, csl):
+        for encode_json in (False, True):
+            assert instrument.to_dict(encode_json) == _asdict(instrument, encode_json)
+
+    assert eq_option.to_dict() == {'underlier': '.FTSE', 'expirationDate': '2024-06-21', 'strikePrice': 'ATMS',
+                                   'optionType': OptionType.Call, 'premium': 0.0, 'assetClass': AssetClass.Equity,
+                                   'type': AssetType.Option}
+    assert csl.to_dict()['doubleParams'] == [{'doubleValue': 1.0}]
+
+
+def test_cached_hash():
+    eq_option = EqOption('.FTSE', strike_price='ATMS')
+    assert hash(eq_option) == hash(EqOption('.FTSE', strike_price='ATMS'))
+
+    eq_option.strike_price = 'ATMF'
+    assert hash(eq_option) == hash(EqOption('.FTSE', strike_price='ATMF'))
+    clone = eq_option.clone(strike_price='ATM')
+    assert hash(clone) == hash(EqOption('.FTSE', strike_price='ATM'))
+    eq_option.from_instance(clone)
+    assert hash(eq_option) == hash(clone)
+    unpickled = pickle.loads(pickle.dumps(eq_option))
+    assert unpickled == eq_option
+    assert '_Base__hash' in eq_option.__dict__ and '_Base__hash' not in unpickled.__dict__
+    # Setting the current value again keeps the cached hash
+    eq_option.strike_price = eq_option.strike_price
+    assert '_Base__hash' in eq_option.__dict__
+
+    # Legs can be changed without their parent knowing, so are hashed each time
+    mcb = FXMultiCrossBinary(legs=(FXMultiCrossBinaryLeg(pair='USDJPY'),))
+    hash(mcb)
+    mcb.legs[0].pair = 'GBPUSD'
+    assert hash(mcb) == hash(FXMultiCrossBinary(legs=(FXMultiCrossBinaryLeg(pair='GBPUSD'),)))
@@ -13,7 +13,9 @@ KIND, either express or implied.  See the License for the
 specific language governing permissions and limitations
 under the License.
 """
+import copy
 import datetime as dt
+import pickle
 from unittest import mock
 
 import gs_quant.risk as risk
@@ -21,6 +23,7 @@ import numpy as np
 import pandas as pd
 from gs_quant.api.gs.assets import GsAssetApi
 from gs_quant.api.gs.portfolios import GsPortfolioApi
+from gs_quant.common import Currency
 from gs_quant.datetime import business_day_offset
 from gs_quant.instrument import IRSwap, IRSwaption, CurveScenario
 from gs_quant.markets import HistoricalPricingContext, PricingContext, BackToTheFuturePricingContext, \
@@ -110,6 +113,15 @@ def test_construction():
     assert p1 == p2
     assert p2 == p3
 
+    assert Portfolio((swap1, Portfolio(swap2))) == Portfolio((swap1, Portfolio(swap2)))
+    assert Portfolio(swap1) != Portfolio((swap1, swap2))
+    assert Portfolio((swap1, swap2)) != Portfolio(swap1)
+    assert Portfolio((swap1, swap2)) != Portfolio((swap1, Portfolio(swap2)))
+    assert Portfolio((swap1, Portfolio(swap2))) != Portfolio((swap1, swap2))
+
+    assert hash(Portfolio((swap1, Portfolio(swap2)))) == hash(Portfolio((swap1, Portfolio(swap2))))
+    assert hash(Portfolio((swap1, swap1))) != hash(Portfolio(()))
+
 
 def test_historical_pricing(mocker):
     with MockCalc(mocker):
@@ -206,6 +218,24 @@ def test_nested_portfolios(mocker):
     portfolio = Portfolio((swap6, portfolio1_1, portfolio1_2), name='portfolio')
 
     assert portfolio.paths('USD-swap') == (PortfolioPath(2), PortfolioPath((1, 1, 0)), PortfolioPath((2, 1, 0)))
+    assert portfolio.paths(swap4) == (PortfolioPath((1, 0)),)
+    assert portfolio.paths(IRSwap('Pay', '10y', 'JPY', name='JPY-swap')) == (PortfolioPath((1, 0)),)
+    assert portfolio.all_portfolios == (portfolio1_1, portfolio1_2, portfolio2_1, portfolio2_2)
+    # Portfolios nested in several parents are listed once
+    shared = Portfolio((portfolio1_1, Portfolio((portfolio1_1,), name='parent')), name='shared')
+    assert shared.all_portfolios == (portfolio1_1, shared[1], portfolio2_1)
+    assert 'EUR-swap' in portfolio
+    assert swap3 in portfolio
+    assert len(portfolio.all_instruments) == 6
+    assert next(portfolio.iter_all_instruments()) is swap6
+    assert tuple(portfolio.iter_all_instruments()) == portfolio.all_instruments
+
+    assert portfolio.all_paths == (PortfolioPath(0), PortfolioPath((1, 0)), PortfolioPath((2, 0)),
+                                   PortfolioPath((1, 1, 0)), PortfolioPath((1, 1, 1)), PortfolioPath((1, 1, 2)),
+                                   PortfolioPath((2, 1, 0)), PortfolioPath((2, 1, 1)), PortfolioPath((2, 1, 2)))
+    portfolio2_1.append(IRSwap('Pay', '10y', 'CAD', name='CAD-swap'))
+    assert PortfolioPath((1, 1, 3)) in portfolio.all_paths
+    assert 'CAD-swap' in portfolio
 
 
 def test_single_instrument(mocker):
@@ -348,6 +378,133 @@ def test_from_frame():
     assert new_port_df[swap] == swap
     assert new_port_df[swaption] == swaption
 
+    data = pd.DataFrame({'asset_class': ['Rates', None, 'Rates'], 'type': ['Swap', None, 'Swap'],
+                         'termination_date': ['10y', None, '5y'], 'rate': [0.01, np.nan, np.nan],
+                         'ccy': ['USD', None, 'EUR']})
+    portfolio = Portfolio.from_frame(data, mappings={'fixed_rate': 'rate',
+                                                     'notional_currency': lambda row: row['ccy']})
+    assert len(portfolio) == 2
+    assert (portfolio[0].termination_date, portfolio[0].fixed_rate, portfolio[0].notional_currency) == \
+        ('10y', 0.01, Currency.USD)
+    assert (portfolio[1].termination_date, portfolio[1].fixed_rate, portfolio[1].notional_currency) == \
+        ('5y', None, Currency.EUR)
+
+
+def test_to_frame_mappings():
+    portfolio = Portfolio((IRSwap('Pay', '5y', 'USD', notional_amount=1), IRSwap('Pay', '10y', 'EUR')))
+
+    def double_notional(df):
+        return df['notional_amount'] * 2
+
+    double_notional.__vectorized__ = True
+    df = portfolio.to_frame(mappings={'tenor': 'termination_date',
+                                      'ccy': lambda row: row['notional_currency'],
+                                      'double_notional': double_notional})
+    assert df['tenor'].to_list() == ['5y', '10y']
+    assert df['ccy'].to_list() == [Currency.USD, Currency.EUR]
+    assert df['double_notional'].to_list()[0] == 2
+
+
+def test_csv_round_trip(tmp_path):
+    swap = IRSwap('Pay', '5y', 'USD', notional_amount=1, name='swap')
+    swaption = IRSwaption(notional_currency='GBP', expiration_date='10y')
+    csv_file = str(tmp_path / 'portfolio.csv')
+    Portfolio((swap, swaption)).to_csv(csv_file, ignored_cols=['name'])
+
+    with open(csv_file) as f:
+        # Columns are written in sorted order
+        assert f.readline().strip().split(',') == ['', 'asset_class', 'expiration_date', 'fee', 'notional_amount',
+                                                   'notional_currency', 'pay_or_receive', 'termination_date', 'type']
+
+    portfolio = Portfolio.from_csv(csv_file)
+    assert (portfolio[0].termination_date, portfolio[0].notional_currency, portfolio[0].name) == \
+        ('5y', Currency.USD, None)
+    assert portfolio[1].expiration_date == '10y'
+
+
+def test_slots():
+    swap = IRSwap('Pay', '5y', 'USD')
+    portfolio = Portfolio((swap, Portfolio(IRSwap('Pay', '10y', 'EUR'), name='sub')), name='top')
+    assert not hasattr(portfolio, '__dict__')
+
+    for copied in (portfolio.clone(), pickle.loads(pickle.dumps(portfolio)), copy.copy(portfolio)):
+        assert copied is not portfolio
+        assert copied == portfolio
+        assert copied.name == 'top'
+        assert copied.all_paths == (PortfolioPath(0), PortfolioPath((1, 0)))
+
+
+def test_unique_instruments():
+    swap1 = IRSwap('Pay', '5y', 'USD')
+    swap2 = IRSwap('Pay', '10y', 'EUR')
+    portfolio = Portfolio((swap2, swap1, swap2, IRSwap('Pay', '10y', 'EUR'), Portfolio((swap1, swap2))))
+
+    assert portfolio.instruments == (swap2, swap1)
+    assert portfolio.instruments[0] is swap2
+    assert portfolio.all_instruments == (swap2, swap1)
+
+
+def test_pop():
+    swap1 = IRSwap('Pay', '5y', 'USD', name='swap1')
+    swap2 = IRSwap('Pay', '10y', 'USD', name='swap2')
+    swap3 = IRSwap('Pay', '2y', 'USD', name='swap3')
+    sub_portfolio = Portfolio((swap3, swap1), name='sub')
+    portfolio = Portfolio((swap1, swap2, sub_portfolio, swap2))
+
+    assert portfolio.pop(1) == swap2
+    assert portfolio.priceables == (swap1, sub_portfolio, swap2)
+
+    assert portfolio.pop('swap1') == (swap1, swap1)
+    assert portfolio.priceables == (sub_portfolio, swap2)
+
+    assert portfolio.pop(PortfolioPath((0, 1))) == swap1
+    assert sub_portfolio.priceables == (swap3,)
+    assert portfolio.paths('swap3') == (PortfolioPath((0, 0)),)
+
+    assert portfolio.pop(-1) == swap2
+    assert portfolio.priceables == (sub_portfolio,)
+
+
+def test_contains():
+    swap1 = IRSwap('Pay', '5y', 'USD', name='swap1')
+    swap2 = IRSwap('Pay', '10y', 'USD', name='swap2')
+    sub_portfolio = Portfolio((swap2,), name='sub')
+    portfolio = Portfolio((swap1, sub_portfolio))
+
+    assert 'swap1' in portfolio and 'swap2' in portfolio and 'sub' in portfolio
+    assert swap2 in portfolio and sub_portfolio in portfolio
+    assert IRSwap('Pay', '10y', 'USD', name='swap2') in portfolio
+    assert 'swap3' not in portfolio and 1 not in portfolio
+
+    swap3 = IRSwap('Pay', '2y', 'USD', name='swap3')
+    sub_portfolio.append(swap3)
+    assert 'swap3' in portfolio and swap3 in portfolio
+
+    swap3.termination_date = '3y'
+    assert swap3 in portfolio
+
+    sub_portfolio.pop('swap2')
+    assert 'swap2' not in portfolio and swap2 not in portfolio
+
+    # Copies don't share the cached contents of the original
+    assert swap1 in portfolio
+    for copied in (copy.copy(portfolio), copy.deepcopy(portfolio), pickle.loads(pickle.dumps(portfolio))):
+        swap1.termination_date = '6y'
+        assert (swap1 in copied) is (copied[0] is swap1)
+        swap1.termination_date = '5y'
+
+
+def test_deeply_nested_paths():
+    swap = IRSwap('Pay', '5y', 'USD', name='swap')
+    depth = 2000
+    portfolio = swap
+    for _ in range(depth):
+        portfolio = Portfolio(portfolio)
+
+    expected = (PortfolioPath((0,) * depth),)
+    assert portfolio.paths(swap) == expected
+    assert portfolio.paths('swap') == expected
+
 
 def test_single_instrument_new_mock(mocker):
     with MockCalc(mocker):
@@ -28,7 +28,8 @@ from gs_quant.common import PayReceive, Currency
 from gs_quant.datetime import business_day_offset, today
 from gs_quant.errors import MqValueError
 from gs_quant.instrument import IRSwap
-from gs_quant.markets import PricingContext, CloseMarket, OverlayMarket, MarketDataCoordinate
+from gs_quant.markets import PricingContext, CloseMarket, OverlayMarket, MarketDataCoordinate, \
+    HistoricalPricingContext
 from gs_quant.markets.portfolio import Portfolio
 from gs_quant.risk import RollFwd
 from gs_quant.target.common import PricingLocation
@@ -106,6 +107,7 @@ def test_market_data_object():
 
     assert overlay_market.coordinates[0] == MarketDataCoordinate.from_dict(coord_val_pair[0]['coordinate'])
     assert overlay_market.redacted_coordinates[0] == MarketDataCoordinate.from_dict(coord_val_pair[1]['coordinate'])
+    assert overlay_market.market_data_dict == {overlay_market.coordinates[0]: 0.9973194889}
 
 
 def test_pricing_context_metadata():
@@ -379,3 +381,46 @@ def test_provider(calc_mock):
     inst.PROVIDER = TestProvider
     pc.calc(inst, None)
     calc_mock.assert_called_with(inst, RiskKey(GsRiskApi, None, None, ANY, None, None))
+
+
+def test_shared_parameters():
+    assert PricingContext()._parameters == PricingContext()._parameters
+    assert PricingContext(csa_term='EUR-OIS')._parameters != PricingContext()._parameters
+    assert PricingContext(csa_term='EUR-OIS')._parameters.csa_term == 'EUR-OIS'
+
+    # Changing one context's parameters does not affect any other context's
+    parameters = PricingContext(csa_term='EUR-OIS')._parameters
+    hash(parameters)
+    parameters.raw_results = False
+    assert PricingContext(csa_term='EUR-OIS')._parameters.raw_results is True
+    assert hash(PricingContext(csa_term='EUR-OIS')._parameters) != hash(parameters)
+
+
+def test_historical_markets():
+    past = dt.date(2021, 1, 4)
+    future = dt.date.today() + dt.timedelta(days=7)
+    markets = HistoricalPricingContext(dates=[past, future])._markets([past, future], 'NYC')
+    assert markets[past].date == past
+    assert markets[future].date == business_day_offset(future, -1, roll='forward')
+    assert markets[future].location == PricingLocation.NYC
+
+    class CustomMarketContext(HistoricalPricingContext):
+        def _market(self, date: dt.date, location: str) -> CloseMarket:
+            return CloseMarket(location=location, date=past, check=False)
+
+    # Each date's market still comes from _market
+    markets = CustomMarketContext(dates=[past, future])._markets([past, future], 'NYC')
+    assert markets[future].date == past
+
+
+def test_close_market_date_cached():
+    from gs_quant.markets.markets import close_market_date, _prev_business_date
+
+    future = dt.date.today() + dt.timedelta(days=10)
+    expected = business_day_offset(future, -1, roll='forward')
+    assert close_market_date(date=future) == expected
+
+    hits = _prev_business_date.cache_info().hits
+    assert close_market_date(date=future) == expected
+    assert _prev_business_date.cache_info().hits == hits + 1
+    assert close_market_date(date=dt.date(2021, 1, 4)) == dt.date(2021, 1, 4)
@@ -13,12 +13,15 @@ KIND, either express or implied.  See the License for the
 specific language governing permissions and limitations
 under the License.
 """
+import copy
+import inspect
+import pickle
 from dataclasses import field, dataclass
 from enum import Enum
 from typing import Union, Tuple, Optional
 
 import gs_quant.base as base
-from gs_quant.base import handle_camel_case_args, Base, EnumBase
+from gs_quant.base import handle_camel_case_args, Base, EnumBase, HashableDict, RiskKey, Sentinel, get_enum_value
 
 
 class TestEnum(EnumBase, Enum):
@@ -38,11 +41,35 @@ class BaseSubclass(Base):
     attr_6: TestEnum = field(default=None)
 
 
+@handle_camel_case_args
+@dataclass
+class BaseSubSubclass(BaseSubclass):
+    attr_7: Optional[str] = field(default=None)
+
+
+def test_fields_by_name_per_class():
+    BaseSubclass(instance_attr='test')
+    obj = BaseSubSubclass(attr_7='test')
+    assert obj.attr_7 == 'test'
+    assert 'attr_7' not in BaseSubclass._fields_by_name()
+    assert 'attr_7' in BaseSubSubclass._fields_by_name()
+
+
 def test_handle_camel_case_args():
     # Handling camelcase args on init
     obj = BaseSubclass(instanceAttr="test")
     assert obj.instance_attr == "test"
 
+    obj = BaseSubclass(instance_attr="test", attr_1="test_1")
+    assert obj.instance_attr == "test"
+    assert obj.attr_1 == "test_1"
+
+    try:
+        BaseSubclass(instance_attr="test", instanceAttr="test")
+        assert False
+    except ValueError:
+        pass
+
 
 def test_base_getter():
     obj = BaseSubclass(instance_attr="test")
@@ -59,6 +86,29 @@ def test_base_setter():
     assert obj.instance_attr == "test"
 
 
+def test_setter_fields_per_class():
+    obj = BaseSubSubclass()
+    for _ in range(2):
+        obj.instanceAttr = 'test'
+        obj._private = 1
+        assert obj.instance_attr == 'test'
+        assert obj._private == 1
+        assert 'instanceAttr' not in obj.__dict__
+
+    @dataclass
+    class NonInitSubclass(BaseSubclass):
+        non_init_attr: str = field(default=None, init=False)
+
+    obj = NonInitSubclass()
+    obj.instanceAttr = 'test'
+    assert obj.instance_attr == 'test'
+    try:
+        obj.nonInitAttr = 'test'
+        assert False
+    except ValueError:
+        pass
+
+
 def test_setter_coercion():
     base._is_supported_generic_cache = {}
     obj = BaseSubclass(instance_attr='test', attr_1=None, attr_2=('test', 1.0, 1), attr_3='test',
@@ -79,7 +129,309 @@ def test_setter_coercion():
     assert isinstance(obj.attr_6, TestEnum)
     # all handled as type matches, we do not get to the generic coercion/default case
     assert not base._is_supported_generic_cache
-    # str with type hint Enum gets cast to Enum
+    # str with type hint Enum gets cast to Enum, looking up exact values directly
     obj.attr_6 = 'Enum_1'
-    assert isinstance(obj.attr_6, TestEnum)
+    assert obj.attr_6 is TestEnum.Enum_1
+    assert not base._is_supported_generic_cache
+    obj.attr_6 = 'enum_2'
+    assert obj.attr_6 is TestEnum.Enum_2
     assert TestEnum in base._is_supported_generic_cache
+    try:
+        obj.attr_6 = ['Enum_1']
+        assert False
+    except ValueError:
+        pass
+
+
+def test_hashable_dict_hash():
+    d = HashableDict(a=1, b='test')
+    h = hash(d)
+    assert hash(d) == h
+    d['c'] = 2
+    assert hash(d) != h
+    del d['c']
+    assert hash(d) == h
+    d.update(c=2)
+    assert hash(d) == hash(HashableDict(a=1, b='test', c=2))
+    assert hash(d) == hash(HashableDict(c=2, b='test', a=1))
+
+    nested = HashableDict(a={'b': 1})
+    h = hash(nested)
+    nested['a']['b'] = 2
+    assert hash(nested) != h
+    assert hash(HashableDict(a={'b': 1, 'c': 2})) == hash(HashableDict(a={'c': 2, 'b': 1}))
+
+    @handle_camel_case_args
+    @dataclass(unsafe_hash=True)
+    class HashableSubclass(Base):
+        attr_1: Optional[str] = field(default=None)
+
+    # Mutable values such as Base objects can be changed after hashing, so their hashes stay consistent with equality
+    with_base = HashableDict(a=HashableSubclass(attr_1='test'))
+    hash(with_base)
+    with_base['a'].attr_1 = 'other'
+    assert with_base == HashableDict(a=HashableSubclass(attr_1='other'))
+    assert hash(with_base) == hash(HashableDict(a=HashableSubclass(attr_1='other')))
+
+    # Cached hashes are not carried over to copies, which may be in a process hashing strings differently
+    hash(d)
+    for other in (pickle.loads(pickle.dumps(d)), copy.copy(d), copy.deepcopy(d)):
+        assert other == d
+        assert '_HashableDict__hash' not in other.__dict__
+
+
+def test_clone():
+    obj = BaseSubclass(instance_attr='test', attr_2=('test', 1.0), attr_6=TestEnum.Enum_1)
+    clone = obj.clone(attr_1='test_1', attr_6='Enum_2')
+    assert clone is not obj
+    assert clone.instance_attr == 'test'
+    assert clone.attr_2 == ('test', 1.0)
+    assert clone.attr_1 == 'test_1'
+    assert clone.attr_6 == TestEnum.Enum_2
+    assert obj.attr_1 is None
+    assert obj.attr_6 == TestEnum.Enum_1
+    assert obj.clone(instanceAttr='test_2').instance_attr == 'test_2'
+
+    try:
+        obj.clone(attr_8='test')
+        assert False
+    except TypeError:
+        pass
+
+
+def test_copy():
+    obj = BaseSubclass(instance_attr='test', attr_2=('test', 1.0), attr_6=TestEnum.Enum_1)
+    obj.name = 'obj'
+    copied = copy.copy(obj)
+    assert copied is not obj
+    assert type(copied) is BaseSubclass
+    assert copied == obj
+    assert (copied.name, copied.instance_attr, copied.attr_2) == ('obj', 'test', ('test', 1.0))
+
+    copied.attr_1 = 'test_1'
+    assert obj.attr_1 is None
+
+
+def test_slots():
+    key = RiskKey('provider', None, None, None, None, None)
+    assert not hasattr(key, '__dict__')
+    assert key.provider == 'provider'
+
+    sentinel = Sentinel('test')
+    assert not hasattr(sentinel, '__dict__')
+    assert sentinel == Sentinel('test')
+    assert not sentinel == Sentinel('other')
+
+
+def test_enum_missing():
+    assert TestEnum('enum_2') is TestEnum.Enum_2
+    assert TestEnum('ENUM_1') is TestEnum.Enum_1
+    try:
+        TestEnum('Enum_3')
+        assert False
+    except ValueError:
+        pass
+
+
+def test_get_enum_value():
+    for _ in range(2):
+        assert get_enum_value(TestEnum, 'Enum_1') is TestEnum.Enum_1
+        assert get_enum_value(TestEnum, 'enum_2') is TestEnum.Enum_2
+        assert get_enum_value(TestEnum, TestEnum.Enum_2) is TestEnum.Enum_2
+        assert get_enum_value(TestEnum, None) is None
+        # Invalid values are passed through, and not cached
+        assert get_enum_value(TestEnum, 'Enum_3') == 'Enum_3'
+        assert get_enum_value(TestEnum, ['Enum_1']) == ['Enum_1']
+
+    assert 'Enum_3' not in base._enum_value_cache[TestEnum]
+    # Other strings matching members are cached with the members' values
+    assert base._enum_value_cache[TestEnum]['enum_2'] is TestEnum.Enum_2
+
+    # Field setters and decoders look members up in, and add to, the same cache
+    obj = BaseSubclass(attr_6='ENUM_1')
+    assert obj.attr_6 is TestEnum.Enum_1
+    assert base._enum_value_cache[TestEnum]['ENUM_1'] is TestEnum.Enum_1
+    assert base._build_enum_decoder(TestEnum)('enum_1') is TestEnum.Enum_1
+    assert base._enum_value_cache[TestEnum]['enum_1'] is TestEnum.Enum_1
+
+
+def test_tuple_type_matcher():
+    matcher = base._get_type_matcher(Tuple[str, ...])
+    assert matcher(())
+    assert matcher(('a', TestEnum.Enum_1))
+    assert not matcher(('a', 1))
+    assert not matcher(['a'])
+
+    matcher = base._get_type_matcher(Tuple[BaseSubclass, ...])
+    assert matcher((BaseSubclass(), BaseSubSubclass()))
+    assert not matcher((BaseSubclass(), None))
+
+
+def test_union_type_matcher():
+    matcher = base._get_type_matcher(Optional[Union[float, str]])
+    assert all(matcher(v) for v in (None, 1.0, 1, 'ATM', TestEnum.Enum_1))
+    assert not matcher(())
+
+    matcher = base._get_type_matcher(Union[Tuple[Optional[str], ...], str])
+    assert all(matcher(v) for v in ('a', ('a', None), ()))
+    assert not matcher(1)
+
+    matcher = base._get_type_matcher(Optional[Tuple[BaseSubclass, ...]])
+    assert all(matcher(v) for v in (None, (), (BaseSubclass(),)))
+    assert not any(matcher(v) for v in ('a', (None,), BaseSubclass()))
+
+
+def test_generated_init():
+    @handle_camel_case_args
+    @dataclass
+    class RequiredArgSubclass(Base):
+        required_attr: str
+        attr_6: TestEnum = field(default='Enum_1')
+        other_attr: Optional[float] = field(default=None)
+
+    for _ in range(2):
+        # The default is coerced as before
+        obj = RequiredArgSubclass('test', otherAttr=1.0)
+        assert obj.__dict__ == {'required_attr': 'test', 'attr_6': TestEnum.Enum_1, 'other_attr': 1.0}
+        obj = RequiredArgSubclass('test', 'enum_2')
+        assert obj.attr_6 is TestEnum.Enum_2 and obj.other_attr is None
+        # Defaults which are the class attribute are not stored on the instance
+        assert 'other_attr' not in obj.__dict__
+        assert obj == RequiredArgSubclass('test', 'enum_2', None)
+        assert obj.as_dict() == {'required_attr': 'test', 'attr_6': TestEnum.Enum_2}
+        # Values of the field's type(s), including ints for floats, are stored as is
+        assert RequiredArgSubclass('test', TestEnum.Enum_2, 2).__dict__ == \
+            {'required_attr': 'test', 'attr_6': TestEnum.Enum_2, 'other_attr': 2}
+    try:
+        RequiredArgSubclass()
+        assert False
+    except TypeError:
+        pass
+
+
+def test_from_instance():
+    obj = BaseSubclass(attr_1='test', attr_6='Enum_2')
+    obj.from_instance(BaseSubclass(attr_2=(1.0,)))
+    assert (obj.attr_1, obj.attr_2, obj.attr_6) == (None, (1.0,), None)
+    assert obj == BaseSubclass(attr_2=(1.0,))
+
+    try:
+        obj.from_instance(object())
+        assert False
+    except ValueError:
+        pass
+
+
+def test_as_dict():
+    @dataclass
+    class NonInitSubclass(BaseSubclass):
+        non_init_attr: str = field(default='test', init=False)
+
+        @property
+        def attr_1(self):
+            return 'property'
+
+        @attr_1.setter
+        def attr_1(self, value):
+            pass
+
+    obj = NonInitSubclass(instance_attr='test', attr_6='Enum_1')
+    assert obj.as_dict() == {'instance_attr': 'test', 'attr_1': 'property', 'attr_2': (), 'attr_6': TestEnum.Enum_1,
+                             'non_init_attr': 'test'}
+    assert obj.as_dict(as_camel_case=True)['instanceAttr'] == 'test'
+
+
+def test_setter_type_matcher_per_field():
+    obj = BaseSubclass(attr_1='test', attr_6='Enum_1')
+    base._type_matcher_cache = {}
+    obj.attr_1 = 'test_2'
+    obj.attr_6 = 'Enum_2'
+    assert (obj.attr_1, obj.attr_6) == ('test_2', TestEnum.Enum_2)
+    # The matchers were resolved when the field was first set
+    assert not base._type_matcher_cache
+
+    # Fields of the same type share a converter
+    sub_obj = BaseSubSubclass()
+    sub_obj.attr_6 = 'Enum_1'
+    assert sub_obj.attr_6 is TestEnum.Enum_1
+    assert BaseSubSubclass._Base__setattr_fields['attr_6'][3] is BaseSubclass._Base__setattr_fields['attr_6'][3]
+
+
+def test_generated_init_setters():
+    set_values = []
+
+    @handle_camel_case_args
+    @dataclass
+    class PropertySubclass(BaseSubclass):
+        @property
+        def attr_1(self):
+            return 'property'
+
+        @attr_1.setter
+        def attr_1(self, value):
+            set_values.append(value)
+
+    obj = PropertySubclass(attr_1='test', attr_2=[1.0], attr_6='Enum_2')
+    assert set_values == ['test']
+    assert obj.attr_1 == 'property'
+    # Values are still coerced
+    assert obj.attr_2 == (1.0,) and obj.attr_6 is TestEnum.Enum_2
+
+    # Setting goes through the property, while other fields are stored in the instance dict
+    obj.attr_1 = 'test_2'
+    obj.attr_6 = 'Enum_1'
+    assert set_values == ['test', 'test_2']
+    assert obj.__dict__['attr_6'] is TestEnum.Enum_1
+
+
+def test_generated_init_undecorated_subclass():
+    set_keys = []
+
+    class SetattrSubclass(BaseSubclass):
+        def __setattr__(self, key, value):
+            set_keys.append(key)
+            super().__setattr__(key, value)
+
+    # Subclasses are initialised via the dataclass __init__, which sets every field through their __setattr__
+    for _ in range(2):
+        BaseSubclass(attr_1='test')
+        obj = SetattrSubclass(instanceAttr='test', attr_6='Enum_2')
+        assert set_keys == list(BaseSubclass._fields_by_name())
+        assert (obj.instance_attr, obj.attr_6) == ('test', TestEnum.Enum_2)
+        set_keys.clear()
+
+
+def test_generated_init_camel_case_args():
+    @handle_camel_case_args
+    @dataclass
+    class RequiredArgSubclass(Base):
+        required_attr: str
+        other_attr: Optional[float] = field(default=None)
+
+    for _ in range(2):
+        obj = RequiredArgSubclass(requiredAttr='test', otherAttr=1)
+        assert (obj.required_attr, obj.other_attr) == ('test', 1)
+        obj = RequiredArgSubclass('test', otherAttr=1.0)
+        assert (obj.required_attr, obj.other_attr) == ('test', 1.0)
+
+    assert '**kwargs' not in str(inspect.signature(RequiredArgSubclass))
+    try:
+        RequiredArgSubclass()
+        assert False
+    except TypeError:
+        pass
+
+    try:
+        RequiredArgSubclass(required_attr='test', requiredAttr='test')
+        assert False
+    except ValueError:
+        pass
+
+    try:
+        RequiredArgSubclass('test', unknownAttr='test')
+        assert False
+    except TypeError:
+        pass
+
+    # Translated argument names are resolved once per class
+    assert base._arg_names_cache[RequiredArgSubclass]['otherAttr'] == ('other_attr', 'other_attr')